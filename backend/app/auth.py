@@ -2,10 +2,11 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
+from .utils.password_hashing import run_hashing
 import os
 from dotenv import load_dotenv
 from .models import UserInDB
-from .database import db
+from .database.user_repository import UserRepository
 
 load_dotenv()
 
@@ -21,14 +22,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_hashing(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_hashing(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_user_by_username(username: str) -> Optional[UserInDB]:
-    user = db.users.find_one({"username": username})
+async def get_user_by_username(username: str) -> Optional[UserInDB]:
+    user = await UserRepository.get_by_username(username)
     if user:
         return UserInDB(**user, id=str(user["_id"]))
     return None 
\ No newline at end of file
@@ -0,0 +1,135 @@
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from app.database.mongo import db
+
+# Declarative index registry: collection name -> indexes every deployment needs.
+# Names are explicit so ensure_indexes() stays idempotent and the report can
+# match declared indexes against what exists in the database.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True, sparse=True),
+    ],
+    "transactions": [
+        IndexModel([("user_id", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)], name="user_date"),
+        IndexModel(
+            [("user_id", ASCENDING), ("transaction_type", ASCENDING), ("date", DESCENDING)],
+            name="user_type_date",
+        ),
+        IndexModel([("user_id", ASCENDING), ("type", ASCENDING), ("date", DESCENDING)], name="user_legacy_type_date"),
+        IndexModel(
+            [("recurrence_source_id", ASCENDING), ("date", ASCENDING)],
+            name="recurrence_occurrence_unique",
+            unique=True,
+            partialFilterExpression={"recurrence_source_id": {"$exists": True}},
+        ),
+        IndexModel(
+            [("is_recurring", ASCENDING), ("recurrence_next", ASCENDING)],
+            name="recurrence_due",
+            partialFilterExpression={"is_recurring": True},
+        ),
+    ],
+    "monthly_rollups": [
+        IndexModel(
+            [("user_id", ASCENDING), ("month", ASCENDING), ("category", ASCENDING), ("transaction_type", ASCENDING)],
+            name="rollup_key_unique",
+            unique=True,
+        ),
+    ],
+    "goals": [IndexModel([("user_id", ASCENDING)], name="user")],
+    "investments": [IndexModel([("user_id", ASCENDING), ("date", DESCENDING)], name="user_date")],
+    "notifications": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created"),
+        IndexModel([("user_id", ASCENDING), ("read", ASCENDING), ("created_at", DESCENDING)], name="user_read_created"),
+    ],
+    "splits": [IndexModel([("group_id", ASCENDING)], name="group")],
+    "group_balances": [
+        IndexModel([("group_id", ASCENDING), ("member", ASCENDING)], name="group_member_unique", unique=True),
+    ],
+    "health_reports": [IndexModel([("user_id", ASCENDING), ("report_date", DESCENDING)], name="user_report_date")],
+    "emergency_funds": [IndexModel([("user_id", ASCENDING)], name="user")],
+    "reports": [IndexModel([("user_id", ASCENDING), ("generated_at", DESCENDING)], name="user_generated")],
+    "savings_advice": [IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created")],
+    "prices": [IndexModel([("symbol", ASCENDING), ("date", ASCENDING)], name="symbol_date")],
+}
+
+# Collections that need options at creation time and so must exist before
+# anything writes to them.
+COLLECTION_OPTIONS: Dict[str, dict] = {
+    "prices": {"timeseries": {"timeField": "date", "metaField": "symbol", "granularity": "hours"}},
+}
+
+
+async def ensure_indexes() -> None:
+    """
+    Create collections that need creation options, then every registered index.
+    Safe to run on each startup: existing collections and indexes with the same
+    name and spec are left alone. A non-unique index that cannot be built is
+    reported without blocking startup. A unique index that cannot be built
+    (e.g. duplicate data) raises, because writers rely on it for idempotency.
+    """
+    existing_collections = set(await db.list_collection_names())
+    for collection, options in COLLECTION_OPTIONS.items():
+        if collection not in existing_collections:
+            try:
+                await db.create_collection(collection, **options)
+            except OperationFailure as exc:
+                print(f"⚠️  Could not create {collection}: {exc}")
+    missing_unique = []
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            try:
+                await db[collection].create_indexes([index])
+            except OperationFailure as exc:
+                name = f"{collection}.{index.document['name']}"
+                if index.document.get("unique"):
+                    print(f"🛑 Could not build unique index {name}: {exc}")
+                    missing_unique.append(name)
+                else:
+                    print(f"⚠️  Could not ensure index {name}: {exc}")
+    if missing_unique:
+        raise RuntimeError(
+            f"Unique indexes could not be built: {', '.join(missing_unique)}. "
+            "Remove the duplicate documents and restart."
+        )
+
+
+async def index_report() -> Dict[str, dict]:
+    """
+    Compare declared indexes with the database and flag unused ones via $indexStats.
+    Access counters reset when mongod restarts, so "unused" means unused since then.
+    """
+    report = {}
+    existing_collections = set(await db.list_collection_names())
+    for collection, indexes in INDEXES.items():
+        declared = {index.document["name"] for index in indexes}
+        if collection not in existing_collections:
+            report[collection] = {"missing": sorted(declared), "undeclared": [], "unused": []}
+            continue
+        stats = await db[collection].aggregate([{"$indexStats": {}}]).to_list(None)
+        present = {s["name"] for s in stats}
+        report[collection] = {
+            "missing": sorted(declared - present),
+            "undeclared": sorted(present - declared - {"_id_"}),
+            "unused": sorted(s["name"] for s in stats if s["name"] != "_id_" and s["accesses"]["ops"] == 0),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    # python -m app.database.indexes [report|ensure]
+    import asyncio
+    import sys
+
+    async def main(command: str) -> None:
+        if command == "ensure":
+            await ensure_indexes()
+            print("Indexes ensured")
+            return
+        for collection, result in (await index_report()).items():
+            print(f"{collection}:")
+            for key in ("missing", "undeclared", "unused"):
+                print(f"  {key}: {', '.join(result[key]) or '-'}")
+
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "report"))
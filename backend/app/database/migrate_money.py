@@ -0,0 +1,55 @@
+from typing import Dict
+from app.database.mongo import db
+from app.services.debt_split import DebtSplitService
+from app.services.rollups import MonthlyRollupService
+
+# collection -> float fields that gain an integer `<field>_cents` twin
+MONEY_FIELDS = {
+    "transactions": ("amount",),
+    "splits": ("amount",),
+    "goals": ("target_amount", "current_amount"),
+    "savings_goals": ("target_amount", "current_amount"),
+}
+
+
+async def migrate() -> Dict[str, int]:
+    """
+    Backfill `<field>_cents` on documents written before integer cents existed,
+    then rebuild the derived collections in cents. The conversion runs
+    server-side as a pipeline update, so no documents leave MongoDB, and it is
+    idempotent: documents that already have the field are skipped.
+    """
+    migrated = {}
+    for collection, fields in MONEY_FIELDS.items():
+        migrated[collection] = 0
+        for field in fields:
+            cents = f"{field}_cents"
+            result = await db[collection].update_many(
+                {cents: {"$exists": False}, field: {"$type": "number"}},
+                [{"$set": {
+                    cents: {"$toLong": {"$round": [{"$multiply": [f"${field}", 100]}, 0]}},
+                    field: {"$round": [f"${field}", 2]},
+                }}],
+            )
+            migrated[collection] += result.modified_count
+
+    migrated["monthly_rollups"] = await MonthlyRollupService.rebuild()
+    for group_id in await db.splits.distinct("group_id"):
+        await DebtSplitService.rebuild(group_id)
+    return migrated
+
+
+if __name__ == "__main__":
+    # python -m app.database.migrate_money
+    import asyncio
+    from app.database import mongo
+
+    async def main() -> None:
+        mongo.connect()
+        try:
+            for collection, count in (await migrate()).items():
+                print(f"{collection}: {count}")
+        finally:
+            mongo.close()
+
+    asyncio.run(main())
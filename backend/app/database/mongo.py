@@ -1,9 +1,131 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from typing import Optional
+from dotenv import load_dotenv
 import os
 
+load_dotenv()
+
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "investment_banking")
 
-client = AsyncIOMotorClient(MONGO_URL)
-db: Database = client[DATABASE_NAME]
+# Connection pool sizing, per MongoDB host
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Keeps running counters of connection pool activity for /health."""
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.created = 0
+        self.closed = 0
+        self.checkout_failures = 0
+        self.cleared = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open += 1
+        self.created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open -= 1
+        self.closed += 1
+
+    def connection_check_out_started(self, event):
+        self.waiting += 1
+
+    def connection_check_out_failed(self, event):
+        self.waiting -= 1
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.waiting -= 1
+        self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def snapshot(self) -> dict:
+        return {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "min_pool_size": MONGO_MIN_POOL_SIZE,
+            "max_idle_time_ms": MONGO_MAX_IDLE_TIME_MS,
+            "open_connections": self.open,
+            "in_use": self.checked_out,
+            "waiting_for_connection": self.waiting,
+            "utilization": round(self.checked_out / MONGO_MAX_POOL_SIZE, 3) if MONGO_MAX_POOL_SIZE else None,
+            "connections_created": self.created,
+            "connections_closed": self.closed,
+            "checkout_failures": self.checkout_failures,
+            "pool_clears": self.cleared,
+        }
+
+
+pool_stats = PoolStatsListener()
+_client: Optional[AsyncIOMotorClient] = None
+
+
+def connect() -> AsyncIOMotorClient:
+    """Create the application-wide client; called once from the FastAPI lifespan."""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            MONGO_URL,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            event_listeners=[pool_stats],
+        )
+    return _client
+
+
+def close() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    # Scripts run outside the app lifespan get a client on first use.
+    return _client or connect()
+
+
+def get_database() -> AsyncIOMotorDatabase:
+    return get_client()[DATABASE_NAME]
+
+
+class _Database:
+    """
+    Module-level handle that resolves to the shared client's database on each
+    access, so `from app.database.mongo import db` keeps working without
+    binding a client at import time.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_database(), name)
+
+    def __getitem__(self, name):
+        return get_database()[name]
+
+
+db = _Database()
@@ -8,7 +8,7 @@ class GoalSchema(BaseModel):
     name: str
     target_amount: float
     current_amount: float = 0.0
-    deadline: Optional[date]
+    deadline: Optional[date] = None
     status: Optional[str] = "active"  # e.g., active, completed, archived
 
     class Config:
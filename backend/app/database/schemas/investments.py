@@ -9,6 +9,8 @@ class InvestmentSchema(BaseModel):
     amount: float
     date: date
     status: Optional[str] = "active"  # e.g., active, sold, matured
+    symbol: Optional[str] = None  # ticker priced from the local price store
+    quantity: Optional[float] = None  # units bought for `amount`
 
     class Config:
         orm_mode = True
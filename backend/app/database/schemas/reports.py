@@ -7,7 +7,7 @@ class ReportSchema(BaseModel):
     user_id: str
     period: str  # e.g., '2024-Q1', '2024-07'
     generated_at: datetime
-    summary: Optional[str]
+    summary: Optional[str] = None
 
     class Config:
         orm_mode = True
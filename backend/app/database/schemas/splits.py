@@ -7,7 +7,7 @@ class SplitSchema(BaseModel):
     payer_id: str
     amount: float
     participants: List[str]  # user IDs
-    description: Optional[str]
+    description: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -8,7 +8,7 @@ class TransactionSchema(BaseModel):
     type: str  # e.g., income, expense, transfer
     amount: float
     date: datetime
-    description: Optional[str]
+    description: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -0,0 +1,41 @@
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
+from app.database.mongo import db
+
+
+class DuplicateUserError(Exception):
+    """A unique index rejected the user; `field` is the taken field (username or email)."""
+
+    def __init__(self, field: str):
+        super().__init__(field)
+        self.field = field
+
+
+def _duplicate_field(exc: DuplicateKeyError) -> str:
+    key_pattern = (exc.details or {}).get("keyPattern") or {}
+    if key_pattern:
+        return next(iter(key_pattern))
+    # Servers that omit keyPattern still name the index in the message.
+    return "email" if "email_unique" in str(exc) else "username"
+
+
+class UserRepository:
+    """Async access to the `users` collection for the authentication path."""
+
+    @staticmethod
+    async def get_by_username(username: str) -> Optional[dict]:
+        return await db.users.find_one({"username": username})
+
+    @staticmethod
+    async def username_exists(username: str) -> bool:
+        return await db.users.count_documents({"username": username}, limit=1) > 0
+
+    @staticmethod
+    async def create(user: dict) -> dict:
+        """Insert a user; raises DuplicateUserError when the username or email is taken (unique indexes)."""
+        try:
+            result = await db.users.insert_one(user)
+        except DuplicateKeyError as exc:
+            raise DuplicateUserError(_duplicate_field(exc)) from exc
+        user["_id"] = result.inserted_id
+        return user
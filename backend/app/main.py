@@ -20,15 +20,37 @@ from app.routes import (
     savings_advisor_router,
 )
 from app.database.database import init_db
+from app.database import mongo
+from app.database.indexes import ensure_indexes
+from app.utils import password_hashing, process_pool
+from app.utils.auth import principal_cache
+from app.services.chart_renderer import chart_cache
+from app.services.pdf_jobs import PdfJobService
+from app.services.recurrence import RecurrenceScheduler
+from app.services.notification_hub import NotificationHub
+from app.services.portfolio_tracker import valuation_cache
+from app.services.performance import performance_cache
+from app.services.goal_simulation import simulation_cache
 
 load_dotenv()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Investment Banking Platform starting up...")
+    mongo.connect()
     await init_db()
+    await ensure_indexes()
+    PdfJobService.start()
+    RecurrenceScheduler.start()
+    NotificationHub.start()
     yield
     print("👋 Investment Banking Platform shutting down...")
+    await NotificationHub.stop()
+    await RecurrenceScheduler.stop()
+    await PdfJobService.stop()
+    password_hashing.shutdown()
+    process_pool.shutdown()
+    mongo.close()
 
 app = FastAPI(
     title="Investment Banking Platform",
@@ -75,7 +97,19 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "Investment Banking Platform"}
+    return {
+        "status": "healthy",
+        "service": "Investment Banking Platform",
+        "mongo_pool": mongo.pool_stats.snapshot(),
+        "password_hashing": password_hashing.stats.snapshot(),
+        "auth_cache": principal_cache.stats(),
+        "chart_cache": chart_cache.stats(),
+        "valuation_cache": valuation_cache.stats(),
+        "performance_cache": performance_cache.stats(),
+        "simulation_cache": simulation_cache.stats(),
+        "pdf_jobs": PdfJobService.stats(),
+        "notification_streams": NotificationHub.stats()
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,8 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.database.database import get_db
-from app.database.models import User, Transaction, SavingsGoal, AdvisorRecommendation
+from app.database.models import User, SavingsGoal, AdvisorRecommendation
 from app.utils.auth import get_current_active_user
+from app.services.frame_analytics import expense_by_category, load_frame, totals
 from app.utils.schemas import (
     SavingsGoalCreate, 
     SavingsGoal as SavingsGoalSchema, 
@@ -122,16 +123,13 @@ async def delete_savings_goal(
 
 @router.get("/recommendations")
 async def get_recommendations(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Get AI-powered financial recommendations"""
     # Get user's financial data
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id
-    ).all()
+    transactions = await load_frame(str(current_user.id))
     
-    if not transactions:
+    if transactions.empty:
         return {
             "recommendations": [
                 {
@@ -144,10 +142,11 @@ async def get_recommendations(
         }
     
     # Calculate financial metrics
-    total_income = sum(t.amount for t in transactions if t.transaction_type == "income")
-    total_expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
-    net_income = total_income - total_expenses
-    savings_rate = (net_income / total_income * 100) if total_income > 0 else 0
+    metrics = totals(transactions)
+    total_income = metrics["total_income"]
+    total_expenses = metrics["total_expenses"]
+    net_income = metrics["net_income"]
+    savings_rate = metrics["savings_rate"]
     
     # Generate recommendations based on financial data
     recommendations = []
@@ -176,11 +175,7 @@ async def get_recommendations(
         })
     
     # Spending analysis
-    category_spending = {}
-    for transaction in transactions:
-        if transaction.transaction_type == "expense":
-            category = transaction.category
-            category_spending[category] = category_spending.get(category, 0) + transaction.amount
+    category_spending = expense_by_category(transactions)
     
     # Identify high spending categories
     if category_spending:
@@ -5,10 +5,11 @@ from datetime import timedelta
 from app.database.database import get_db
 from app.database.models import User
 from app.utils.auth import (
-    verify_password, 
-    get_password_hash, 
+    verify_password_async, 
+    get_password_hash_async, 
     create_access_token, 
     get_current_active_user,
+    invalidate_user_cache,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from app.utils.schemas import UserCreate, User as UserSchema, Token, Message
@@ -34,7 +35,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -53,7 +54,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     """Login user and return access token"""
     # Find user by username
     user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -82,24 +83,24 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
 @router.put("/me", response_model=UserSchema)
 async def update_user_info(
     user_update: dict,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Update current user information"""
+    username = current_user.username
+    invalidate_user_cache(username)
     for field, value in user_update.items():
         if hasattr(current_user, field) and field != "id" and field != "hashed_password":
             setattr(current_user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await current_user.save()
+    invalidate_user_cache(username)
     return current_user
 
 @router.delete("/me", response_model=Message)
 async def delete_user(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Delete current user account"""
-    db.delete(current_user)
-    db.commit()
+    await current_user.delete()
+    invalidate_user_cache(current_user.username)
     return {"message": "User account deleted successfully"} 
\ No newline at end of file
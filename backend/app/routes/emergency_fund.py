@@ -3,6 +3,7 @@ from app.database.mongo import db
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from bson import ObjectId
+from app.utils.streaming import StreamFormat, projection_for, stream_cursor
 
 class EmergencyFundSchema(BaseModel):
     id: Optional[str] = Field(None, alias="_id")
@@ -26,11 +27,9 @@ async def create_emergency_fund(fund: EmergencyFundSchema):
     return fund_dict
 
 @router.get("/", response_model=List[EmergencyFundSchema])
-async def list_emergency_funds(user_id: str):
-    funds = await db.emergency_funds.find({"user_id": user_id}).to_list(100)
-    for f in funds:
-        f["_id"] = str(f["_id"])
-    return funds
+async def list_emergency_funds(user_id: str, format: StreamFormat = "json"):
+    cursor = db.emergency_funds.find({"user_id": user_id}, projection_for(EmergencyFundSchema))
+    return stream_cursor(cursor, format, EmergencyFundSchema)
 
 @router.get("/{fund_id}", response_model=EmergencyFundSchema)
 async def get_emergency_fund(fund_id: str):
@@ -3,22 +3,43 @@ from app.database.mongo import db
 from app.database.schemas.splits import SplitSchema
 from typing import List
 from bson import ObjectId
+from pymongo import ReturnDocument
+from app.services.debt_split import DebtSplitService
+from app.utils.money import with_cents
+from app.utils.streaming import StreamFormat, projection_for, stream_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=SplitSchema, status_code=status.HTTP_201_CREATED)
 async def create_split(split: SplitSchema):
-    split_dict = split.dict(by_alias=True, exclude_unset=True)
+    split_dict = with_cents(split.dict(by_alias=True, exclude_unset=True))
     result = await db.splits.insert_one(split_dict)
+    await DebtSplitService.apply(split_dict)
     split_dict["_id"] = str(result.inserted_id)
     return split_dict
 
 @router.get("/", response_model=List[SplitSchema])
-async def list_splits(group_id: str):
-    splits = await db.splits.find({"group_id": group_id}).to_list(100)
-    for s in splits:
-        s["_id"] = str(s["_id"])
-    return splits
+async def list_splits(group_id: str, format: StreamFormat = "json"):
+    cursor = db.splits.find({"group_id": group_id}, projection_for(SplitSchema))
+    return stream_cursor(cursor, format, SplitSchema)
+
+@router.get("/groups/{group_id}/balances")
+async def get_group_balances(group_id: str):
+    """Net balance per member; positive means the member is owed money"""
+    balances = await DebtSplitService.balances(group_id)
+    return {
+        "group_id": group_id,
+        "balances": [
+            {"member": member, "balance": cents / 100}
+            for member, cents in sorted(balances.items(), key=lambda item: item[1], reverse=True)
+        ]
+    }
+
+@router.get("/groups/{group_id}/settlement")
+async def get_group_settlement(group_id: str):
+    """Fewest-transfers plan that settles every balance in the group"""
+    transfers = await DebtSplitService.settle(group_id)
+    return {"group_id": group_id, "transfers": transfers}
 
 @router.get("/{split_id}", response_model=SplitSchema)
 async def get_split(split_id: str):
@@ -30,17 +51,21 @@ async def get_split(split_id: str):
 
 @router.put("/{split_id}", response_model=SplitSchema)
 async def update_split(split_id: str, split: SplitSchema):
-    update_data = {k: v for k, v in split.dict(exclude_unset=True).items() if v is not None}
-    result = await db.splits.update_one({"_id": ObjectId(split_id)}, {"$set": update_data})
-    if result.modified_count == 0:
+    update_data = with_cents({k: v for k, v in split.dict(exclude_unset=True).items() if v is not None})
+    previous = await db.splits.find_one_and_update(
+        {"_id": ObjectId(split_id)}, {"$set": update_data}, return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
         raise HTTPException(status_code=404, detail="Split not found or not updated")
-    updated_split = await db.splits.find_one({"_id": ObjectId(split_id)})
+    updated_split = {**previous, **update_data}
+    await DebtSplitService.apply_change(previous, updated_split)
     updated_split["_id"] = str(updated_split["_id"])
     return updated_split
 
 @router.delete("/{split_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_split(split_id: str):
-    result = await db.splits.delete_one({"_id": ObjectId(split_id)})
-    if result.deleted_count == 0:
+    deleted = await db.splits.find_one_and_delete({"_id": ObjectId(split_id)})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Split not found")
+    await DebtSplitService.apply(deleted, sign=-1)
     return None
@@ -1,24 +1,37 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from app.database.mongo import db
 from app.database.schemas.goals import GoalSchema
-from typing import List
+from app.services.goal_simulation import (
+    SIMULATION_MAX_MONTHS,
+    SIMULATION_MAX_PATHS,
+    GoalSimulationService,
+    months_between,
+)
+from typing import List, Optional
+from datetime import date, datetime, time
 from bson import ObjectId
+from app.utils.money import with_cents
+from app.utils.streaming import StreamFormat, projection_for, stream_cursor
 
 router = APIRouter()
 
+def _storable(data: dict) -> dict:
+    # BSON has no date-only type; deadlines are stored at midnight UTC.
+    if isinstance(data.get("deadline"), date) and not isinstance(data["deadline"], datetime):
+        data["deadline"] = datetime.combine(data["deadline"], time.min)
+    return with_cents(with_cents(data, "target_amount"), "current_amount")
+
 @router.post("/", response_model=GoalSchema, status_code=status.HTTP_201_CREATED)
 async def create_goal(goal: GoalSchema):
-    goal_dict = goal.dict(by_alias=True, exclude_unset=True)
+    goal_dict = _storable(goal.dict(by_alias=True, exclude_unset=True))
     result = await db.goals.insert_one(goal_dict)
     goal_dict["_id"] = str(result.inserted_id)
     return goal_dict
 
 @router.get("/", response_model=List[GoalSchema])
-async def list_goals():
-    goals = await db.goals.find().to_list(100)
-    for g in goals:
-        g["_id"] = str(g["_id"])
-    return goals
+async def list_goals(format: StreamFormat = "json"):
+    cursor = db.goals.find({}, projection_for(GoalSchema))
+    return stream_cursor(cursor, format, GoalSchema)
 
 @router.get("/{goal_id}", response_model=GoalSchema)
 async def get_goal(goal_id: str):
@@ -28,9 +41,43 @@ async def get_goal(goal_id: str):
     goal["_id"] = str(goal["_id"])
     return goal
 
+@router.get("/{goal_id}/simulate")
+async def simulate_goal(
+    goal_id: str,
+    months: Optional[int] = Query(None, ge=1, le=SIMULATION_MAX_MONTHS, description="Horizon; defaults to the months left until the deadline"),
+    paths: int = Query(10000, ge=100, le=SIMULATION_MAX_PATHS),
+    seed: Optional[int] = Query(None, ge=0),
+    annual_return: float = Query(0.03, ge=-0.5, le=0.5),
+    return_volatility: float = Query(0.05, ge=0, le=1),
+    inflation: float = Query(0.02, ge=-0.1, le=0.5),
+    history_months: int = Query(24, ge=1, le=120)
+):
+    """
+    Monte Carlo projection of the goal: monthly contributions are drawn from the
+    owner's historical net income, savings earn a random return and the target
+    grows with inflation. Returns the probability of reaching the target by
+    the horizon and percentile bands of the balance.
+    """
+    goal = await db.goals.find_one({"_id": ObjectId(goal_id)})
+    if not goal:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    if months is None:
+        deadline = goal.get("deadline")
+        if not deadline:
+            raise HTTPException(status_code=400, detail="Goal has no deadline; pass `months`")
+        if isinstance(deadline, str):
+            deadline = date.fromisoformat(deadline[:10])
+        months = months_between(datetime.utcnow().date(), deadline)
+        if months <= 0:
+            raise HTTPException(status_code=400, detail="Goal deadline has passed; pass `months`")
+        months = min(months, SIMULATION_MAX_MONTHS)
+    return await GoalSimulationService.simulate_goal(
+        goal, months, paths, seed, annual_return, return_volatility, inflation, history_months
+    )
+
 @router.put("/{goal_id}", response_model=GoalSchema)
 async def update_goal(goal_id: str, goal: GoalSchema):
-    update_data = {k: v for k, v in goal.dict(exclude_unset=True).items() if v is not None}
+    update_data = _storable({k: v for k, v in goal.dict(exclude_unset=True).items() if v is not None})
     result = await db.goals.update_one({"_id": ObjectId(goal_id)}, {"$set": update_data})
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Goal not found or not updated")
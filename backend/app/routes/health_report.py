@@ -3,6 +3,7 @@ from app.database.mongo import db
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from bson import ObjectId
+from app.utils.streaming import StreamFormat, projection_for, stream_cursor
 from datetime import datetime
 
 class HealthReportSchema(BaseModel):
@@ -26,11 +27,9 @@ async def create_health_report(report: HealthReportSchema):
     return report_dict
 
 @router.get("/", response_model=List[HealthReportSchema])
-async def list_health_reports(user_id: str):
-    reports = await db.health_reports.find({"user_id": user_id}).to_list(100)
-    for r in reports:
-        r["_id"] = str(r["_id"])
-    return reports
+async def list_health_reports(user_id: str, format: StreamFormat = "json"):
+    cursor = db.health_reports.find({"user_id": user_id}, projection_for(HealthReportSchema))
+    return stream_cursor(cursor, format, HealthReportSchema)
 
 @router.get("/{report_id}", response_model=HealthReportSchema)
 async def get_health_report(report_id: str):
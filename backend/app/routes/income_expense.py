@@ -3,22 +3,35 @@ from app.database.mongo import db
 from app.database.schemas.transactions import TransactionSchema
 from typing import List
 from bson import ObjectId
+from app.utils.streaming import StreamFormat, projection_for, stream_cursor
+from pymongo import ReturnDocument
+from app.services.rollups import MonthlyRollupService
+from app.utils.money import from_cents, with_cents
 
 router = APIRouter()
 
+def _as_schema(document: dict) -> dict:
+    # Transactions written through /api/transactions store `transaction_type`.
+    if document.get("type") is None:
+        document["type"] = document.pop("transaction_type", None)
+    if document.get("amount_cents") is not None:
+        document["amount"] = from_cents(document.pop("amount_cents"))
+    return document
+
 @router.post("/", response_model=TransactionSchema, status_code=status.HTTP_201_CREATED)
 async def create_transaction(transaction: TransactionSchema):
-    transaction_dict = transaction.dict(by_alias=True, exclude_unset=True)
+    transaction_dict = with_cents(transaction.dict(by_alias=True, exclude_unset=True))
     result = await db.transactions.insert_one(transaction_dict)
+    await MonthlyRollupService.apply(transaction_dict)
     transaction_dict["_id"] = str(result.inserted_id)
     return transaction_dict
 
 @router.get("/", response_model=List[TransactionSchema])
-async def list_transactions(user_id: str):
-    transactions = await db.transactions.find({"user_id": user_id}).to_list(100)
-    for t in transactions:
-        t["_id"] = str(t["_id"])
-    return transactions
+async def list_transactions(user_id: str, format: StreamFormat = "json"):
+    cursor = db.transactions.find(
+        {"user_id": user_id}, projection_for(TransactionSchema, "transaction_type", "amount_cents")
+    )
+    return stream_cursor(cursor, format, TransactionSchema, _as_schema)
 
 @router.get("/{transaction_id}", response_model=TransactionSchema)
 async def get_transaction(transaction_id: str):
@@ -30,17 +43,21 @@ async def get_transaction(transaction_id: str):
 
 @router.put("/{transaction_id}", response_model=TransactionSchema)
 async def update_transaction(transaction_id: str, transaction: TransactionSchema):
-    update_data = {k: v for k, v in transaction.dict(exclude_unset=True).items() if v is not None}
-    result = await db.transactions.update_one({"_id": ObjectId(transaction_id)}, {"$set": update_data})
-    if result.modified_count == 0:
+    update_data = with_cents({k: v for k, v in transaction.dict(exclude_unset=True).items() if v is not None})
+    existing = await db.transactions.find_one_and_update(
+        {"_id": ObjectId(transaction_id)}, {"$set": update_data}, return_document=ReturnDocument.BEFORE
+    )
+    if not existing:
         raise HTTPException(status_code=404, detail="Transaction not found or not updated")
-    updated_transaction = await db.transactions.find_one({"_id": ObjectId(transaction_id)})
+    updated_transaction = {**existing, **update_data}
+    await MonthlyRollupService.apply_change(existing, updated_transaction)
     updated_transaction["_id"] = str(updated_transaction["_id"])
     return updated_transaction
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_transaction(transaction_id: str):
-    result = await db.transactions.delete_one({"_id": ObjectId(transaction_id)})
-    if result.deleted_count == 0:
+    deleted = await db.transactions.find_one_and_delete({"_id": ObjectId(transaction_id)})
+    if not deleted:
         raise HTTPException(status_code=404, detail="Transaction not found")
+    await MonthlyRollupService.apply(deleted, sign=-1)
     return None
@@ -1,24 +1,69 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
 from app.database.mongo import db
 from app.database.schemas.investments import InvestmentSchema
-from typing import List
+from app.services.performance import PerformanceService, PerformanceWindow, invalidate_performance
+from app.services.portfolio_tracker import PortfolioTrackerService, invalidate_valuations
+from app.services.prices import PriceStore, PriceStoreError
+from typing import List, Optional
+from datetime import date, datetime, time
 from bson import ObjectId
+from app.utils.streaming import StreamFormat, projection_for, stream_cursor
 
 router = APIRouter()
 
+def _storable(data: dict) -> dict:
+    # BSON has no date-only type; purchases are stored at midnight UTC.
+    if isinstance(data.get("date"), date) and not isinstance(data["date"], datetime):
+        data["date"] = datetime.combine(data["date"], time.min)
+    if data.get("symbol"):
+        data["symbol"] = data["symbol"].strip().upper()
+    return data
+
+def _invalidate(user_id: Optional[str] = None) -> None:
+    invalidate_valuations(user_id)
+    invalidate_performance(user_id)
+
 @router.post("/", response_model=InvestmentSchema, status_code=status.HTTP_201_CREATED)
 async def create_investment(investment: InvestmentSchema):
-    investment_dict = investment.dict(by_alias=True, exclude_unset=True)
+    investment_dict = _storable(investment.dict(by_alias=True, exclude_unset=True))
     result = await db.investments.insert_one(investment_dict)
+    _invalidate(investment.user_id)
     investment_dict["_id"] = str(result.inserted_id)
     return investment_dict
 
 @router.get("/", response_model=List[InvestmentSchema])
-async def list_investments(user_id: str):
-    investments = await db.investments.find({"user_id": user_id}).to_list(100)
-    for i in investments:
-        i["_id"] = str(i["_id"])
-    return investments
+async def list_investments(user_id: str, format: StreamFormat = "json"):
+    cursor = db.investments.find({"user_id": user_id}, projection_for(InvestmentSchema))
+    return stream_cursor(cursor, format, InvestmentSchema)
+
+@router.get("/valuation")
+async def get_valuation(user_id: str, as_of: Optional[date] = None):
+    """Market value, unrealized P&L and daily value series of the user's open holdings."""
+    return await PortfolioTrackerService.valuation(user_id, as_of)
+
+@router.get("/performance")
+async def get_performance(user_id: str, window: PerformanceWindow = "1y", as_of: Optional[date] = None):
+    """
+    Time-weighted return, IRR, annualized volatility and max drawdown over
+    `window`, with the daily value and growth-index series for charting.
+    """
+    return await PerformanceService.performance(user_id, window, as_of)
+
+@router.post("/prices")
+async def load_prices(file: UploadFile = File(...), symbol: Optional[str] = Form(None)):
+    """
+    Load a daily price history CSV (date and close or adj close columns, plus
+    symbol unless `symbol` is given). Overlapping dates are replaced.
+    """
+    content = (await file.read()).decode("utf-8-sig")
+    try:
+        count = await PriceStore.load_csv(content, symbol)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except PriceStoreError as exc:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
+    _invalidate()
+    return {"loaded": count}
 
 @router.get("/{investment_id}", response_model=InvestmentSchema)
 async def get_investment(investment_id: str):
@@ -30,17 +75,19 @@ async def get_investment(investment_id: str):
 
 @router.put("/{investment_id}", response_model=InvestmentSchema)
 async def update_investment(investment_id: str, investment: InvestmentSchema):
-    update_data = {k: v for k, v in investment.dict(exclude_unset=True).items() if v is not None}
+    update_data = _storable({k: v for k, v in investment.dict(exclude_unset=True).items() if v is not None})
     result = await db.investments.update_one({"_id": ObjectId(investment_id)}, {"$set": update_data})
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Investment not found or not updated")
     updated_investment = await db.investments.find_one({"_id": ObjectId(investment_id)})
+    _invalidate(updated_investment["user_id"])
     updated_investment["_id"] = str(updated_investment["_id"])
     return updated_investment
 
 @router.delete("/{investment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_investment(investment_id: str):
-    result = await db.investments.delete_one({"_id": ObjectId(investment_id)})
-    if result.deleted_count == 0:
+    deleted = await db.investments.find_one_and_delete({"_id": ObjectId(investment_id)})
+    if not deleted:
         raise HTTPException(status_code=404, detail="Investment not found")
+    _invalidate(deleted["user_id"])
     return None
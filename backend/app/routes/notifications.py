@@ -1,10 +1,19 @@
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+import json
+import os
+from fastapi import APIRouter, HTTPException, status, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from app.database.mongo import db
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from bson import ObjectId
+from app.services.notifier import NotifierService, invalidate_unread
+from app.services.notification_hub import NotificationHub
 from datetime import datetime
 
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = float(os.getenv("NOTIFICATION_STREAM_HEARTBEAT_SECONDS", "15"))
+
 class NotificationSchema(BaseModel):
     id: Optional[str] = Field(None, alias="_id")
     user_id: str
@@ -16,22 +25,91 @@ class NotificationSchema(BaseModel):
         orm_mode = True
         allow_population_by_field_name = True
 
+class BroadcastRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1)
+    message: str
+
 router = APIRouter()
 
 @router.post("/", response_model=NotificationSchema, status_code=status.HTTP_201_CREATED)
 async def create_notification(notification: NotificationSchema):
-    notification_dict = notification.dict(by_alias=True, exclude_unset=True)
+    notification_dict = notification.dict(by_alias=True, exclude_none=True)
     result = await db.notifications.insert_one(notification_dict)
+    invalidate_unread(notification_dict["user_id"])
     notification_dict["_id"] = str(result.inserted_id)
+    NotificationHub.publish_local(notification_dict)
     return notification_dict
 
 @router.get("/", response_model=List[NotificationSchema])
-async def list_notifications(user_id: str):
-    notifications = await db.notifications.find({"user_id": user_id}).to_list(100)
-    for n in notifications:
-        n["_id"] = str(n["_id"])
+async def list_notifications(
+    user_id: str,
+    response: Response,
+    unread_only: bool = False,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page")
+):
+    notifications, next_cursor = await NotifierService.list_notifications(user_id, unread_only, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    for notification in notifications:
+        notification["_id"] = str(notification["_id"])
     return notifications
 
+def _sse(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    payload = json.dumps(jsonable_encoder(data, custom_encoder={ObjectId: str}))
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {event}\ndata: {payload}\n\n"
+
+@router.get("/stream")
+async def stream_notifications(user_id: str):
+    """
+    Server-sent events: an `unread` event with the current count, then one
+    `notification` event per new notification and an `update` event per
+    edited or read one, each change followed by the new `unread` count.
+    Replaces polling the list.
+    """
+    queue = NotificationHub.subscribe(user_id)
+
+    async def events():
+        try:
+            yield _sse("unread", {"unread": await NotifierService.unread_count(user_id)})
+            while True:
+                try:
+                    event, payload = await asyncio.wait_for(queue.get(), NOTIFICATION_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection.
+                    yield ": keep-alive\n\n"
+                    continue
+                if event == "notification":
+                    yield _sse("notification", payload, str(payload["_id"]))
+                    continue
+                if event == "update":
+                    yield _sse("update", payload)
+                # The write may have come from another worker, whose cached
+                # count this process never saw invalidated.
+                invalidate_unread(user_id)
+                yield _sse("unread", {"unread": await NotifierService.unread_count(user_id)})
+        finally:
+            NotificationHub.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/unread-count")
+async def get_unread_count(user_id: str):
+    return {"user_id": user_id, "unread": await NotifierService.unread_count(user_id)}
+
+@router.post("/broadcast", status_code=status.HTTP_201_CREATED)
+async def broadcast_notification(broadcast: BroadcastRequest):
+    return {"sent": await NotifierService.broadcast(broadcast.user_ids, broadcast.message)}
+
+@router.post("/read-all")
+async def mark_all_notifications_read(user_id: str):
+    return {"updated": await NotifierService.mark_all_read(user_id)}
+
 @router.get("/{notification_id}", response_model=NotificationSchema)
 async def get_notification(notification_id: str):
     notification = await db.notifications.find_one({"_id": ObjectId(notification_id)})
@@ -47,12 +125,17 @@ async def update_notification(notification_id: str, notification: NotificationSc
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found or not updated")
     updated_notification = await db.notifications.find_one({"_id": ObjectId(notification_id)})
+    invalidate_unread(updated_notification["user_id"])
     updated_notification["_id"] = str(updated_notification["_id"])
+    NotificationHub.publish_local(updated_notification, "update")
     return updated_notification
 
 @router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_notification(notification_id: str):
-    result = await db.notifications.delete_one({"_id": ObjectId(notification_id)})
-    if result.deleted_count == 0:
+    deleted = await db.notifications.find_one_and_delete({"_id": ObjectId(notification_id)})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Notification not found")
+    invalidate_unread(deleted["user_id"])
+    if not deleted.get("read"):
+        NotificationHub.publish_local({"user_id": deleted["user_id"]}, "unread")
     return None
@@ -1,121 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import FileResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
 from typing import List, Optional
 from datetime import datetime, timedelta
 import json
-import pandas as pd
+import pyarrow as pa
 from app.database.database import get_db
-from app.database.models import User, Transaction, Report
+from app.database.models import User
 from app.utils.auth import get_current_active_user
+from app.utils.exports import ExportFormat, stream_export
+from app.utils.money import from_cents
 from app.utils.schemas import ReportCreate, Report as ReportSchema, FinancialSummary
+from app.services.rollups import MonthlyRollupService
+from app.services.chart_renderer import ChartRendererService
+from app.services.pdf_jobs import PdfJobService, QueueFullError
 
 router = APIRouter()
 
-@router.get("/financial-summary")
+def _totals(buckets: List[dict], key: str) -> dict:
+    totals = {}
+    for bucket in buckets:
+        totals[bucket[key]] = totals.get(bucket[key], 0) + bucket["amount_cents"]
+    return {value: from_cents(cents) for value, cents in totals.items()}
+
+@router.get("/financial-summary", response_model=FinancialSummary)
 async def get_financial_summary(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Get comprehensive financial summary"""
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
-    
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
-    
-    transactions = query.all()
-    
-    if not transactions:
-        return {
-            "total_income": 0,
-            "total_expenses": 0,
-            "net_income": 0,
-            "savings_rate": 0,
-            "monthly_trend": [],
-            "category_breakdown": []
-        }
-    
-    # Calculate basic metrics
-    total_income = sum(t.amount for t in transactions if t.transaction_type == "income")
-    total_expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
-    net_income = total_income - total_expenses
-    savings_rate = (net_income / total_income * 100) if total_income > 0 else 0
-    
-    # Monthly trend analysis
-    monthly_data = {}
-    for transaction in transactions:
-        month_key = transaction.date.strftime("%Y-%m")
-        if month_key not in monthly_data:
-            monthly_data[month_key] = {"income": 0, "expense": 0}
-        
-        if transaction.transaction_type == "income":
-            monthly_data[month_key]["income"] += transaction.amount
-        else:
-            monthly_data[month_key]["expense"] += transaction.amount
-    
-    monthly_trend = [
-        {
-            "month": month,
-            "income": data["income"],
-            "expense": data["expense"],
-            "net": data["income"] - data["expense"]
-        }
-        for month, data in monthly_data.items()
-    ]
-    
-    # Category breakdown
-    category_data = {}
-    for transaction in transactions:
-        category = transaction.category
-        if category not in category_data:
-            category_data[category] = {"income": 0, "expense": 0}
-        
-        if transaction.transaction_type == "income":
-            category_data[category]["income"] += transaction.amount
-        else:
-            category_data[category]["expense"] += transaction.amount
-    
-    category_breakdown = [
-        {
-            "category": category,
-            "income": data["income"],
-            "expense": data["expense"],
-            "net": data["income"] - data["expense"]
-        }
-        for category, data in category_data.items()
-    ]
-    
-    return {
-        "total_income": total_income,
-        "total_expenses": total_expenses,
-        "net_income": net_income,
-        "savings_rate": savings_rate,
-        "monthly_trend": monthly_trend,
-        "category_breakdown": category_breakdown
-    }
+    return await MonthlyRollupService.financial_summary(
+        str(current_user.id), start_date, end_date
+    )
 
 @router.get("/spending-analysis")
 async def get_spending_analysis(
     months: int = Query(6, ge=1, le=24),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Get detailed spending analysis for the last N months"""
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=months * 30)
     
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id,
-        Transaction.date >= start_date,
-        Transaction.transaction_type == "expense"
-    ).all()
+    buckets = await MonthlyRollupService.buckets(
+        str(current_user.id), start_date, end_date, transaction_type="expense"
+    )
+    buckets = [b for b in buckets if b["count"]]
     
-    if not transactions:
+    if not buckets:
         return {
             "total_spending": 0,
             "average_monthly_spending": 0,
@@ -124,30 +58,20 @@ async def get_spending_analysis(
         }
     
     # Calculate spending metrics
-    total_spending = sum(t.amount for t in transactions)
+    total_spending = from_cents(sum(b["amount_cents"] for b in buckets))
     average_monthly_spending = total_spending / months
     
     # Top spending categories
-    category_spending = {}
-    for transaction in transactions:
-        category = transaction.category
-        category_spending[category] = category_spending.get(category, 0) + transaction.amount
-    
     top_categories = sorted(
-        [{"category": cat, "amount": amt} for cat, amt in category_spending.items()],
+        [{"category": cat, "amount": amt} for cat, amt in _totals(buckets, "category").items()],
         key=lambda x: x["amount"],
         reverse=True
     )[:5]
     
     # Spending trend by month
-    monthly_spending = {}
-    for transaction in transactions:
-        month_key = transaction.date.strftime("%Y-%m")
-        monthly_spending[month_key] = monthly_spending.get(month_key, 0) + transaction.amount
-    
     spending_trend = [
         {"month": month, "amount": amount}
-        for month, amount in monthly_spending.items()
+        for month, amount in sorted(_totals(buckets, "month").items())
     ]
     
     return {
@@ -160,20 +84,18 @@ async def get_spending_analysis(
 @router.get("/income-analysis")
 async def get_income_analysis(
     months: int = Query(6, ge=1, le=24),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Get detailed income analysis for the last N months"""
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=months * 30)
     
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id,
-        Transaction.date >= start_date,
-        Transaction.transaction_type == "income"
-    ).all()
+    buckets = await MonthlyRollupService.buckets(
+        str(current_user.id), start_date, end_date, transaction_type="income"
+    )
+    buckets = [b for b in buckets if b["count"]]
     
-    if not transactions:
+    if not buckets:
         return {
             "total_income": 0,
             "average_monthly_income": 0,
@@ -182,30 +104,20 @@ async def get_income_analysis(
         }
     
     # Calculate income metrics
-    total_income = sum(t.amount for t in transactions)
+    total_income = from_cents(sum(b["amount_cents"] for b in buckets))
     average_monthly_income = total_income / months
     
     # Income sources breakdown
-    source_income = {}
-    for transaction in transactions:
-        category = transaction.category
-        source_income[category] = source_income.get(category, 0) + transaction.amount
-    
     income_sources = sorted(
-        [{"source": source, "amount": amt} for source, amt in source_income.items()],
+        [{"source": source, "amount": amt} for source, amt in _totals(buckets, "category").items()],
         key=lambda x: x["amount"],
         reverse=True
     )
     
     # Income trend by month
-    monthly_income = {}
-    for transaction in transactions:
-        month_key = transaction.date.strftime("%Y-%m")
-        monthly_income[month_key] = monthly_income.get(month_key, 0) + transaction.amount
-    
     income_trend = [
         {"month": month, "amount": amount}
-        for month, amount in monthly_income.items()
+        for month, amount in sorted(_totals(buckets, "month").items())
     ]
     
     return {
@@ -215,13 +127,46 @@ async def get_income_analysis(
         "income_trend": income_trend
     }
 
+@router.get("/charts/monthly-expenses")
+async def get_monthly_expenses_chart(
+    request: Request,
+    months: int = Query(6, ge=1, le=24),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Render the monthly spending trend as a PNG bar chart"""
+    analysis = await get_spending_analysis(months, current_user)
+    key, png = await ChartRendererService.expense_bar_chart(analysis["spending_trend"])
+    
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, max-age=60"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=png, media_type="image/png", headers=headers)
+
+def _serialize(report: dict) -> dict:
+    report["id"] = str(report.pop("_id"))
+    return report
+
+async def _find_report(db: AsyncIOMotorDatabase, report_id: str, user_id: str) -> dict:
+    report = None
+    if ObjectId.is_valid(report_id):
+        # Like the saved list, skip reports that were never given report data.
+        report = await db.reports.find_one(
+            {"_id": ObjectId(report_id), "user_id": user_id, "report_data": {"$exists": True}}
+        )
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    return report
+
 @router.post("/generate", response_model=ReportSchema)
 async def generate_report(
     report_type: str,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Generate and save a custom report"""
     # Generate report data based on type
@@ -233,49 +178,137 @@ async def generate_report(
         start_date = end_date.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
     
     # Get financial summary for the period
-    summary = await get_financial_summary(start_date, end_date, current_user, db)
+    summary = await MonthlyRollupService.financial_summary(str(current_user.id), start_date, end_date)
     
     # Create report record
-    report = Report(
-        user_id=current_user.id,
-        report_type=report_type,
-        report_data=json.dumps(summary)
-    )
+    report = {
+        "user_id": str(current_user.id),
+        "report_type": report_type,
+        "report_data": json.dumps(summary),
+        "generated_at": datetime.utcnow()
+    }
     
-    db.add(report)
-    db.commit()
-    db.refresh(report)
+    result = await db.reports.insert_one(report)
+    report["_id"] = result.inserted_id
     
-    return report
+    return _serialize(report)
 
 @router.get("/saved", response_model=List[ReportSchema])
 async def get_saved_reports(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Get all saved reports for the current user"""
-    reports = db.query(Report).filter(
-        Report.user_id == current_user.id
-    ).order_by(Report.generated_at.desc()).all()
+    reports = await db.reports.find(
+        {"user_id": str(current_user.id), "report_data": {"$exists": True}}
+    ).sort("generated_at", -1).to_list(None)
     
-    return reports
+    return [_serialize(report) for report in reports]
 
 @router.get("/saved/{report_id}", response_model=ReportSchema)
 async def get_saved_report(
-    report_id: int,
+    report_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Get a specific saved report"""
-    report = db.query(Report).filter(
-        Report.id == report_id,
-        Report.user_id == current_user.id
-    ).first()
-    
-    if not report:
+    report = await _find_report(db, report_id, str(current_user.id))
+    return _serialize(report)
+
+
+REPORT_EXPORT_SCHEMA = pa.schema([
+    ("section", pa.string()),
+    ("label", pa.string()),
+    ("income", pa.float64()),
+    ("expense", pa.float64()),
+    ("net", pa.float64()),
+])
+
+async def _report_rows(summary: dict):
+    yield {
+        "section": "summary",
+        "label": "total",
+        "income": summary.get("total_income", 0),
+        "expense": summary.get("total_expenses", 0),
+        "net": summary.get("net_income", 0)
+    }
+    for section, key in (("monthly_trend", "month"), ("category_breakdown", "category")):
+        for row in summary.get(section, []):
+            yield {"section": section, "label": row[key], "income": row["income"], "expense": row["expense"], "net": row["net"]}
+
+@router.get("/saved/{report_id}/export")
+async def export_saved_report(
+    report_id: str,
+    format: ExportFormat = "csv",
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Download a saved report's summary, monthly trend and category tables as CSV or Parquet"""
+    report = await _find_report(db, report_id, str(current_user.id))
+    return stream_export(
+        _report_rows(json.loads(report["report_data"])),
+        REPORT_EXPORT_SCHEMA,
+        format,
+        f"report-{report_id}"
+    )
+
+def _job_status(job: dict) -> dict:
+    return {
+        "job_id": job["job_id"],
+        "report_id": job["report_id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "download_url": f"/api/reports/pdf-jobs/{job['job_id']}/download" if job["status"] == "done" else None
+    }
+
+def _owned_job(job_id: str, current_user: User) -> dict:
+    job = PdfJobService.get(job_id, str(current_user.id))
+    if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Report not found"
+            detail="PDF job not found"
         )
-    
-    return report 
\ No newline at end of file
+    return job
+
+@router.post("/{report_id}/pdf", status_code=status.HTTP_202_ACCEPTED)
+async def request_report_pdf(
+    report_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Queue PDF rendering of a saved report; poll the returned job for progress"""
+    report = await _find_report(db, report_id, str(current_user.id))
+    try:
+        job = PdfJobService.enqueue(str(current_user.id), report)
+    except QueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF queue is full, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    return _job_status(job)
+
+@router.get("/pdf-jobs/{job_id}")
+async def get_report_pdf_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the status of a PDF rendering job"""
+    return _job_status(_owned_job(job_id, current_user))
+
+@router.get("/pdf-jobs/{job_id}/download")
+async def download_report_pdf(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download a rendered report PDF"""
+    job = _owned_job(job_id, current_user)
+    if job["status"] != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"PDF job is {job['status']}"
+        )
+    return FileResponse(job["path"], media_type="application/pdf", filename=f"report-{job['report_id']}.pdf")
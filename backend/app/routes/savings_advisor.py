@@ -3,6 +3,7 @@ from app.database.mongo import db
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from bson import ObjectId
+from app.utils.streaming import StreamFormat, projection_for, stream_cursor
 from datetime import datetime
 
 class SavingsAdviceSchema(BaseModel):
@@ -26,11 +27,9 @@ async def create_savings_advice(advice: SavingsAdviceSchema):
     return advice_dict
 
 @router.get("/", response_model=List[SavingsAdviceSchema])
-async def list_savings_advice(user_id: str):
-    advice_list = await db.savings_advice.find({"user_id": user_id}).to_list(100)
-    for a in advice_list:
-        a["_id"] = str(a["_id"])
-    return advice_list
+async def list_savings_advice(user_id: str, format: StreamFormat = "json"):
+    cursor = db.savings_advice.find({"user_id": user_id}, projection_for(SavingsAdviceSchema))
+    return stream_cursor(cursor, format, SavingsAdviceSchema)
 
 @router.get("/{advice_id}", response_model=SavingsAdviceSchema)
 async def get_savings_advice(advice_id: str):
@@ -1,10 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List, Optional
 from datetime import datetime, timedelta
+import os
+import tempfile
+import pyarrow as pa
+from bson import ObjectId
+from pymongo import ReturnDocument
 from app.database.database import get_db
-from app.database.models import User, Transaction
+from app.database.models import User
+from app.services.recurrence import rewatermark
+from app.services.rollups import MonthlyRollupService
+from app.services.transaction_analytics import build_match
+from app.services.statements import StatementService
+from app.services.transaction_import import TransactionImportService, transaction_document
 from app.utils.auth import get_current_active_user
+from app.utils.exports import ExportFormat, rows_from_cursor, stream_export
+from app.utils.importers import csv_rows, json_rows, ofx_rows
+from app.utils.money import from_cents, with_cents
+from app.utils.pagination import encode_cursor, keyset_filter
 from app.utils.schemas import (
     TransactionCreate, 
     Transaction as TransactionSchema, 
@@ -14,160 +30,285 @@ from app.utils.schemas import (
 
 router = APIRouter()
 
+def _serialize(transaction: dict) -> dict:
+    transaction["id"] = str(transaction.pop("_id"))
+    return transaction
+
+async def _find_owned(db: AsyncIOMotorDatabase, transaction_id: str, user_id: str) -> dict:
+    transaction = None
+    if ObjectId.is_valid(transaction_id):
+        transaction = await db.transactions.find_one({"_id": ObjectId(transaction_id), "user_id": user_id})
+    if not transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    return transaction
+
 @router.post("/", response_model=TransactionSchema)
 async def create_transaction(
     transaction: TransactionCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Create a new transaction"""
-    db_transaction = Transaction(
-        user_id=current_user.id,
-        amount=transaction.amount,
-        description=transaction.description,
-        category=transaction.category.value,
-        transaction_type=transaction.transaction_type.value,
-        date=transaction.date or datetime.utcnow(),
-        is_recurring=transaction.is_recurring,
-        recurring_frequency=transaction.recurring_frequency
+    db_transaction = transaction_document(str(current_user.id), transaction)
+    
+    result = await db.transactions.insert_one(db_transaction)
+    db_transaction["_id"] = result.inserted_id
+    await MonthlyRollupService.apply(db_transaction)
+    
+    return _serialize(db_transaction)
+
+async def _upload_chunks(upload):
+    while chunk := await upload.read(64 * 1024):
+        yield chunk
+
+def _import_format(content_type: str, filename: str = "") -> str:
+    filename = filename.lower()
+    if "csv" in content_type or filename.endswith(".csv"):
+        return "csv"
+    if "ofx" in content_type or filename.endswith((".ofx", ".qfx")):
+        return "ofx"
+    if "json" in content_type or filename.endswith(".json"):
+        return "json"
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send a JSON array, CSV or OFX"
     )
+
+@router.post("/bulk")
+async def bulk_import_transactions(
+    request: Request,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Import many transactions at once. Accepts a JSON array body, a raw
+    text/csv or application/x-ofx body, or a multipart upload in field `file`.
+    Valid rows are inserted; invalid ones are reported by row number.
+    """
+    content_type = request.headers.get("content-type", "").lower()
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Multipart imports need a `file` field"
+            )
+        kind = _import_format(upload.content_type or "", upload.filename or "")
+        chunks = _upload_chunks(upload)
+    else:
+        kind = _import_format(content_type)
+        chunks = request.stream()
     
-    db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
+    if kind == "json":
+        body = b"".join([chunk async for chunk in chunks])
+        try:
+            rows = json_rows(body)
+            return await TransactionImportService.import_rows(str(current_user.id), rows)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     
-    return db_transaction
+    parser = csv_rows if kind == "csv" else ofx_rows
+    return await TransactionImportService.import_rows(str(current_user.id), parser(chunks))
 
 @router.get("/", response_model=PaginatedResponse)
 async def get_transactions(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
+    include_total: bool = True,
     transaction_type: Optional[str] = None,
     category: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
-    """Get paginated transactions with optional filters"""
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
+    """Get paginated transactions with optional filters, newest first"""
+    query = {"user_id": str(current_user.id)}
     
     if transaction_type:
-        query = query.filter(Transaction.transaction_type == transaction_type)
+        query["transaction_type"] = transaction_type
     
     if category:
-        query = query.filter(Transaction.category == category)
+        query["category"] = category
+    
+    if start_date or end_date:
+        query["date"] = {}
     
     if start_date:
-        query = query.filter(Transaction.date >= start_date)
+        query["date"]["$gte"] = start_date
     
     if end_date:
-        query = query.filter(Transaction.date <= end_date)
+        query["date"]["$lte"] = end_date
+    
+    total = await db.transactions.count_documents(query) if include_total else None
+    
+    # Keyset mode seeks straight to the cursor; offset mode is kept for page-number clients
+    after = keyset_filter("date", cursor)
+    find = db.transactions.find({"$and": [query, after]} if after else query)
+    find = find.sort([("date", -1), ("_id", -1)])
+    if not cursor:
+        find = find.skip(skip)
+    transactions = await find.limit(limit + 1).to_list(limit + 1)
     
-    total = query.count()
-    transactions = query.offset(skip).limit(limit).all()
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last["date"], last["_id"])
     
     return PaginatedResponse(
-        items=[transaction.__dict__ for transaction in transactions],
+        items=[_serialize(transaction) for transaction in transactions],
         total=total,
-        page=skip // limit + 1,
+        page=None if cursor else skip // limit + 1,
         size=limit,
-        pages=(total + limit - 1) // limit
+        pages=(total + limit - 1) // limit if total is not None else None,
+        next_cursor=next_cursor
+    )
+
+EXPORT_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("date", pa.timestamp("ms")),
+    ("description", pa.string()),
+    ("category", pa.string()),
+    ("transaction_type", pa.string()),
+    ("amount", pa.float64()),
+    ("is_recurring", pa.bool_()),
+    ("recurring_frequency", pa.string()),
+    ("created_at", pa.timestamp("ms")),
+])
+
+EXPORT_FIELDS = {name: 1 for name in EXPORT_SCHEMA.names if name != "id"} | {"type": 1}
+
+def _export_row(transaction: dict) -> dict:
+    return {
+        "id": str(transaction["_id"]),
+        "date": transaction.get("date"),
+        "description": transaction.get("description"),
+        "category": transaction.get("category"),
+        "transaction_type": transaction.get("transaction_type") or transaction.get("type"),
+        "amount": transaction.get("amount"),
+        "is_recurring": transaction.get("is_recurring"),
+        "recurring_frequency": transaction.get("recurring_frequency"),
+        "created_at": transaction.get("created_at"),
+    }
+
+@router.get("/export")
+async def export_transactions(
+    format: ExportFormat = "csv",
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Download the full (optionally filtered) transaction history as CSV or Parquet"""
+    query = build_match(str(current_user.id), start_date, end_date, transaction_type)
+    if category:
+        query["category"] = category
+    
+    cursor = db.transactions.find(query, EXPORT_FIELDS).sort([("date", 1), ("_id", 1)])
+    return stream_export(rows_from_cursor(cursor, _export_row), EXPORT_SCHEMA, format, "transactions")
+
+@router.get("/statement")
+async def download_statement(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download a paginated PDF statement of transactions in the period"""
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="statement-")
+    os.close(fd)
+    try:
+        await StatementService.write_statement(str(current_user.id), path, start_date, end_date)
+    except Exception:
+        os.remove(path)
+        raise
+    
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename="statement.pdf",
+        background=BackgroundTask(os.remove, path)
     )
 
 @router.get("/{transaction_id}", response_model=TransactionSchema)
 async def get_transaction(
-    transaction_id: int,
+    transaction_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Get a specific transaction"""
-    transaction = db.query(Transaction).filter(
-        Transaction.id == transaction_id,
-        Transaction.user_id == current_user.id
-    ).first()
-    
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
-    
-    return transaction
+    transaction = await _find_owned(db, transaction_id, str(current_user.id))
+    return _serialize(transaction)
 
 @router.put("/{transaction_id}", response_model=TransactionSchema)
 async def update_transaction(
-    transaction_id: int,
+    transaction_id: str,
     transaction_update: TransactionUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Update a transaction"""
-    transaction = db.query(Transaction).filter(
-        Transaction.id == transaction_id,
-        Transaction.user_id == current_user.id
-    ).first()
+    transaction = await _find_owned(db, transaction_id, str(current_user.id))
     
-    if not transaction:
+    update_data = transaction_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        if field in ("category", "transaction_type") and value:
+            update_data[field] = value.value
+    with_cents(update_data)
+    update_data.update(rewatermark(transaction, {**transaction, **update_data}) or {})
+    update_data["updated_at"] = datetime.utcnow()
+    
+    previous = await db.transactions.find_one_and_update(
+        {"_id": transaction["_id"]},
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transaction not found"
         )
+    updated = {**previous, **update_data}
+    await MonthlyRollupService.apply_change(previous, updated)
     
-    update_data = transaction_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        if field == "category" and value:
-            setattr(transaction, field, value.value)
-        elif field == "transaction_type" and value:
-            setattr(transaction, field, value.value)
-        else:
-            setattr(transaction, field, value)
-    
-    db.commit()
-    db.refresh(transaction)
-    
-    return transaction
+    return _serialize(updated)
 
 @router.delete("/{transaction_id}")
 async def delete_transaction(
-    transaction_id: int,
+    transaction_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Delete a transaction"""
-    transaction = db.query(Transaction).filter(
-        Transaction.id == transaction_id,
-        Transaction.user_id == current_user.id
-    ).first()
-    
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
+    transaction = await _find_owned(db, transaction_id, str(current_user.id))
     
-    db.delete(transaction)
-    db.commit()
+    deleted = await db.transactions.find_one_and_delete({"_id": transaction["_id"]})
+    if deleted is not None:
+        await MonthlyRollupService.apply(deleted, sign=-1)
     
     return {"message": "Transaction deleted successfully"}
 
 @router.get("/summary/current-month")
 async def get_current_month_summary(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Get current month financial summary"""
     now = datetime.utcnow()
     start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id,
-        Transaction.date >= start_of_month
-    ).all()
+    buckets = await MonthlyRollupService.buckets(str(current_user.id), start_of_month)
     
-    total_income = sum(t.amount for t in transactions if t.transaction_type == "income")
-    total_expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
-    net_income = total_income - total_expenses
+    income_cents = sum(b["amount_cents"] for b in buckets if b["transaction_type"] == "income")
+    expense_cents = sum(b["amount_cents"] for b in buckets if b["transaction_type"] == "expense")
+    total_income = from_cents(income_cents)
+    total_expenses = from_cents(expense_cents)
+    net_income = from_cents(income_cents - expense_cents)
     
     return {
         "total_income": total_income,
@@ -180,29 +321,25 @@ async def get_current_month_summary(
 async def get_category_summary(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Get spending summary by category"""
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
-    
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
-    
-    transactions = query.all()
+    buckets = await MonthlyRollupService.buckets(str(current_user.id), start_date, end_date)
     
     category_summary = {}
-    for transaction in transactions:
-        category = transaction.category
+    for bucket in buckets:
+        if not bucket["count"]:
+            continue
+        category = bucket["category"]
         if category not in category_summary:
             category_summary[category] = {"income": 0, "expense": 0}
         
-        if transaction.transaction_type == "income":
-            category_summary[category]["income"] += transaction.amount
+        if bucket["transaction_type"] == "income":
+            category_summary[category]["income"] += bucket["amount_cents"]
         else:
-            category_summary[category]["expense"] += transaction.amount
+            category_summary[category]["expense"] += bucket["amount_cents"]
     
-    return category_summary 
\ No newline at end of file
+    return {
+        category: {column: from_cents(cents) for column, cents in totals.items()}
+        for category, totals in category_summary.items()
+    }
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from ..models import UserCreate, UserOut, Token
-from ..auth import get_password_hash, verify_password, create_access_token, get_user_by_username
-from ..database import db
+from ..auth import get_password_hash_async, verify_password_async, create_access_token, get_user_by_username
+from ..database.user_repository import DuplicateUserError, UserRepository
 from jose import JWTError, jwt
 from datetime import timedelta
 import os
@@ -15,21 +15,26 @@ ALGORITHM = "HS256"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
 @router.post("/register", response_model=UserOut)
-def register(user: UserCreate):
-    if db.users.find_one({"username": user.username}):
+async def register(user: UserCreate):
+    if await UserRepository.username_exists(user.username):
         raise HTTPException(status_code=400, detail="Username already registered")
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     user_dict = user.dict()
     user_dict["hashed_password"] = hashed_password
     del user_dict["password"]
     user_dict["is_active"] = True
-    db.users.insert_one(user_dict)
+    # The existence check above is a fast path; the unique indexes settle races.
+    try:
+        await UserRepository.create(user_dict)
+    except DuplicateUserError as exc:
+        detail = "Email already registered" if exc.field == "email" else "Username already registered"
+        raise HTTPException(status_code=400, detail=detail)
     return UserOut(username=user.username, email=user.email, is_active=True)
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = get_user_by_username(form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await get_user_by_username(form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     access_token = create_access_token(
         data={"sub": user.username},
@@ -38,7 +43,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -51,11 +56,11 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user_by_username(username)
+    user = await get_user_by_username(username)
     if user is None:
         raise credentials_exception
     return user
 
 @router.get("/me", response_model=UserOut)
-def read_users_me(current_user=Depends(get_current_user)):
+async def read_users_me(current_user=Depends(get_current_user)):
     return UserOut(username=current_user.username, email=current_user.email, is_active=current_user.is_active) 
\ No newline at end of file
@@ -0,0 +1,47 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Callable, Dict, List, Tuple
+from app.utils.cache import TTLCache
+from app.utils.charts import generate_expense_bar_chart
+from app.utils.process_pool import run_in_process
+
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "512"))
+CHART_CACHE_TTL_SECONDS = float(os.getenv("CHART_CACHE_TTL_SECONDS", "3600"))
+
+chart_cache = TTLCache(maxsize=CHART_CACHE_SIZE, ttl=CHART_CACHE_TTL_SECONDS)
+_in_flight: Dict[str, asyncio.Future] = {}
+
+
+def series_key(kind: str, series: List[dict]) -> str:
+    payload = json.dumps({"kind": kind, "series": series}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ChartRendererService:
+    """
+    Renders PNG charts on the shared process pool and caches the bytes by a
+    hash of the input series, so repeat views of unchanged data skip rendering.
+    """
+
+    @staticmethod
+    async def render(kind: str, renderer: Callable[[List[dict]], bytes], series: List[dict]) -> Tuple[str, bytes]:
+        key = series_key(kind, series)
+        png = chart_cache.get(key)
+        if png is not None:
+            return key, png
+
+        # Identical renders requested concurrently share one worker job.
+        pending = _in_flight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(run_in_process(renderer, series))
+            _in_flight[key] = pending
+            pending.add_done_callback(lambda _: _in_flight.pop(key, None))
+        png = await asyncio.shield(pending)
+        chart_cache.set(key, png)
+        return key, png
+
+    @staticmethod
+    async def expense_bar_chart(expenses: List[dict]) -> Tuple[str, bytes]:
+        return await ChartRendererService.render("expense_bar", generate_expense_bar_chart, expenses)
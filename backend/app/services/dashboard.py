@@ -0,0 +1,77 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Awaitable, Callable, Dict
+from app.database.mongo import db
+from app.services.portfolio_tracker import PortfolioTrackerService
+from app.services.rollups import MonthlyRollupService, month_start
+from app.utils.cache import TTLCache
+from app.utils.money import cents_expr, from_cents
+
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30"))
+dashboard_cache = TTLCache(maxsize=int(os.getenv("DASHBOARD_CACHE_SIZE", "5000")), ttl=DASHBOARD_CACHE_TTL_SECONDS)
+
+
+async def _current_month(user_id: str) -> dict:
+    buckets = await MonthlyRollupService.buckets(user_id, month_start(datetime.utcnow()))
+    income = sum(b["amount_cents"] for b in buckets if b["transaction_type"] == "income")
+    expenses = sum(b["amount_cents"] for b in buckets if b["transaction_type"] == "expense")
+    return {"income": from_cents(income), "expenses": from_cents(expenses), "net": from_cents(income - expenses)}
+
+
+async def _goal_progress(user_id: str) -> dict:
+    pipeline = [
+        {"$match": {"user_id": user_id, "status": {"$ne": "archived"}}},
+        {"$group": {
+            "_id": None,
+            "target": {"$sum": cents_expr("target_amount")},
+            "saved": {"$sum": cents_expr("current_amount")},
+            "completed": {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}},
+        }},
+    ]
+    rows = await db.goals.aggregate(pipeline).to_list(1)
+    if not rows:
+        return {"target": 0, "saved": 0, "completed": 0, "progress": 0}
+    row = rows[0]
+    return {
+        "target": from_cents(row["target"]),
+        "saved": from_cents(row["saved"]),
+        "completed": row["completed"],
+        "progress": round(row["saved"] / row["target"] * 100, 2) if row["target"] else 0,
+    }
+
+
+def _count(collection: str) -> Callable[[str], Awaitable[int]]:
+    return lambda user_id: db[collection].count_documents({"user_id": user_id})
+
+
+# Every panel is fetched concurrently; add an entry here to extend the dashboard.
+DASHBOARD_PANELS: Dict[str, Callable[[str], Awaitable]] = {
+    "goals_count": _count("goals"),
+    "investments_count": _count("investments"),
+    "transactions_count": _count("transactions"),
+    "reports_count": _count("reports"),
+    "current_month": _current_month,
+    "goal_progress": _goal_progress,
+    "portfolio_value": PortfolioTrackerService.get_total_investment_value,
+}
+
+
+class DashboardService:
+    @staticmethod
+    async def get_summary(user_id: str, refresh: bool = False) -> dict:
+        """
+        Build the dashboard in one round: all panels are awaited together, so
+        latency tracks the slowest query rather than their sum, and the result
+        is cached per user for DASHBOARD_CACHE_TTL_SECONDS.
+        """
+        if not refresh:
+            cached = dashboard_cache.get(user_id)
+            if cached is not None:
+                return cached
+
+        names = list(DASHBOARD_PANELS)
+        results = await asyncio.gather(*(DASHBOARD_PANELS[name](user_id) for name in names))
+        summary = dict(zip(names, results))
+        dashboard_cache.set(user_id, summary)
+        return summary
@@ -1,20 +1,133 @@
-from typing import List, Dict
+import heapq
+from typing import Dict, Iterable, List
+from pymongo import UpdateOne
 from app.database.mongo import db
+from app.utils.money import allocate, from_cents, to_cents, with_cents
+
+def split_deltas(split: dict, sign: int = 1) -> Dict[str, int]:
+    """
+    Net effect of one split on its group's balances, in cents: the payer is
+    owed the full amount and the participants owe it in equal shares, allocated
+    by largest remainder so the deltas always sum to zero.
+    """
+    participants = split.get("participants") or []
+    if not participants:
+        return {}
+    total = split.get("amount_cents")
+    if total is None:
+        total = to_cents(split["amount"])
+    deltas = {split["payer_id"]: sign * total}
+    for member, owed in zip(participants, allocate(total, len(participants))):
+        deltas[member] = deltas.get(member, 0) - sign * owed
+    return deltas
+
+def settlement_plan(balances: Dict[str, int]) -> List[dict]:
+    """
+    Greedy settle-up over (member -> cents) balances: repeatedly match the
+    largest creditor with the largest debtor. Each step clears at least one
+    member, so the plan has at most members - 1 transfers and runs in
+    O(members log members).
+    """
+    creditors = [(-cents, member) for member, cents in balances.items() if cents > 0]
+    debtors = [(cents, member) for member, cents in balances.items() if cents < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append({"from": debtor, "to": creditor, "amount": from_cents(amount)})
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
 
 class DebtSplitService:
+    """
+    Splits plus the `group_balances` collection: one document per
+    (group_id, member) holding the net balance in integer cents, positive when
+    the member is owed money. Balances move by $inc on every split write, so
+    settling up never re-reads a group's history.
+    """
+
     @staticmethod
     async def split_debt(group_id: str, payer_id: str, amount: float, participants: List[str], description: str = "") -> dict:
         if not participants:
             raise ValueError("Participants list cannot be empty.")
-        share = round(amount / len(participants), 2)
-        split = {
+        split = with_cents({
             "group_id": group_id,
             "payer_id": payer_id,
             "amount": amount,
             "participants": participants,
-            "description": description,
-            "share_per_person": share
-        }
+            "description": description
+        })
+        # Shares differ by at most one cent; this is the largest of them.
+        split["share_per_person"] = from_cents(allocate(split["amount_cents"], len(participants))[0])
         result = await db.splits.insert_one(split)
+        await DebtSplitService.apply(split)
         split["_id"] = str(result.inserted_id)
         return split
+
+    @staticmethod
+    async def apply(split: dict, sign: int = 1) -> None:
+        await DebtSplitService._inc(split["group_id"], [split_deltas(split, sign)])
+
+    @staticmethod
+    async def apply_change(before: dict, after: dict) -> None:
+        if before["group_id"] != after["group_id"]:
+            await DebtSplitService.apply(before, sign=-1)
+            await DebtSplitService.apply(after)
+            return
+        await DebtSplitService._inc(after["group_id"], [split_deltas(before, -1), split_deltas(after)])
+
+    @staticmethod
+    async def _inc(group_id: str, deltas: Iterable[Dict[str, int]]) -> None:
+        merged: Dict[str, int] = {}
+        for delta in deltas:
+            for member, cents in delta.items():
+                merged[member] = merged.get(member, 0) + cents
+        updates = [
+            UpdateOne({"group_id": group_id, "member": member}, {"$inc": {"balance_cents": cents}}, upsert=True)
+            for member, cents in merged.items()
+            if cents
+        ]
+        if updates:
+            await db.group_balances.bulk_write(updates, ordered=False)
+
+    @staticmethod
+    async def balances(group_id: str) -> Dict[str, int]:
+        rows = await db.group_balances.find(
+            {"group_id": group_id, "balance_cents": {"$ne": 0}}, {"_id": 0, "member": 1, "balance_cents": 1}
+        ).to_list(None)
+        return {row["member"]: row["balance_cents"] for row in rows}
+
+    @staticmethod
+    async def settle(group_id: str) -> List[dict]:
+        return settlement_plan(await DebtSplitService.balances(group_id))
+
+    @staticmethod
+    async def rebuild(group_id: str) -> int:
+        """Recompute a group's balances from its splits (backfill or repair)."""
+        await db.group_balances.delete_many({"group_id": group_id})
+        deltas = [split_deltas(split) async for split in db.splits.find({"group_id": group_id})]
+        await DebtSplitService._inc(group_id, deltas)
+        return len(deltas)
+
+
+if __name__ == "__main__":
+    # python -m app.services.debt_split [group_id ...]  (all groups when omitted)
+    import asyncio
+    import sys
+    from app.database import mongo
+
+    async def main(group_ids: List[str]) -> None:
+        mongo.connect()
+        try:
+            for group_id in group_ids or await db.splits.distinct("group_id"):
+                print(f"{group_id}: {await DebtSplitService.rebuild(group_id)} splits")
+        finally:
+            mongo.close()
+
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from app.database.mongo import db
+from app.services.transaction_analytics import build_match
+from app.utils.money import from_cents
+
+FRAME_FIELDS = {"_id": 0, "date": 1, "category": 1, "transaction_type": 1, "type": 1, "amount": 1, "amount_cents": 1}
+FRAME_BATCH_SIZE = 5000
+
+
+class _Columns:
+    def __init__(self):
+        self.dates, self.categories, self.types, self.amounts, self.cents = [], [], [], [], []
+
+    def add(self, record: dict) -> None:
+        self.dates.append(record.get("date"))
+        self.categories.append(record.get("category") or "other")
+        self.types.append(record.get("transaction_type") or record.get("type"))
+        self.amounts.append(record.get("amount", 0))
+        self.cents.append(record.get("amount_cents"))
+
+    def frame(self) -> pd.DataFrame:
+        amounts = np.asarray(self.amounts, dtype="float64")
+        # Documents from before `amount_cents` existed are rounded half-to-even like money.to_cents.
+        cents = pd.Series(self.cents, dtype="float64").fillna(pd.Series(np.round(amounts * 100)))
+        return pd.DataFrame({
+            "date": pd.to_datetime(pd.Series(self.dates, dtype="object")),
+            "category": pd.Categorical(self.categories),
+            "transaction_type": pd.Categorical(self.types),
+            "amount": amounts,
+            "amount_cents": cents.to_numpy(dtype="int64"),
+        })
+
+
+def to_frame(records: Iterable[dict]) -> pd.DataFrame:
+    """
+    Build the columnar transaction frame: datetime64 `date`, categorical
+    `category`/`transaction_type`, float64 `amount` and the int64
+    `amount_cents` all sums run on.
+    """
+    columns = _Columns()
+    for record in records:
+        columns.add(record)
+    return columns.frame()
+
+
+async def load_frame(
+    user_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+) -> pd.DataFrame:
+    """Load a user's transactions into a frame in one projected cursor pass."""
+    cursor = db.transactions.find(
+        build_match(user_id, start_date, end_date, transaction_type), FRAME_FIELDS
+    ).batch_size(FRAME_BATCH_SIZE)
+    columns = _Columns()
+    async for record in cursor:
+        columns.add(record)
+    return columns.frame()
+
+
+def totals(frame: pd.DataFrame) -> dict:
+    by_type = frame.groupby("transaction_type", observed=True)["amount_cents"].sum()
+    income_cents, expense_cents = int(by_type.get("income", 0)), int(by_type.get("expense", 0))
+    total_income = from_cents(income_cents)
+    total_expenses = from_cents(expense_cents)
+    net_income = from_cents(income_cents - expense_cents)
+    return {
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_income": net_income,
+        "savings_rate": (net_income / total_income * 100) if total_income > 0 else 0,
+    }
+
+
+def expense_by_category(frame: pd.DataFrame) -> dict:
+    """Expense total per category, summed in cents."""
+    expenses = frame.loc[frame["transaction_type"] == "expense", ["category", "amount_cents"]]
+    by_category = expenses.groupby("category", observed=True)["amount_cents"].sum()
+    return {category: from_cents(int(cents)) for category, cents in by_category.items()}
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from app.database.mongo import db
+from app.services.rollups import bucket_cents, month_start
+from app.utils.cache import TTLCache
+from app.utils.money import from_cents
+from app.utils.process_pool import run_in_process
+
+SIMULATION_MAX_PATHS = int(os.getenv("SIMULATION_MAX_PATHS", "100000"))
+SIMULATION_MAX_MONTHS = 600
+# Paths are cut back so paths x months stays under this (two float64 matrices
+# of this size are live at the peak).
+SIMULATION_MAX_PATH_MONTHS = int(os.getenv("SIMULATION_MAX_PATH_MONTHS", "12000000"))
+# Runs with at least this many path-months go to the process pool; smaller
+# ones skip the round trip to a worker and run on a thread (NumPy releases the
+# GIL for the heavy array work), never on the event loop.
+SIMULATION_PROCESS_THRESHOLD = int(os.getenv("SIMULATION_PROCESS_THRESHOLD", "1000000"))
+
+simulation_cache = TTLCache(
+    maxsize=int(os.getenv("SIMULATION_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("SIMULATION_CACHE_TTL_SECONDS", "3600")),
+)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def simulate(params: dict) -> dict:
+    """
+    Monte Carlo paths of a goal's balance, month by month. Each month's
+    contribution is bootstrapped from the historical monthly net income and the
+    balance earns a normally distributed return; the target grows with
+    inflation. The recurrence B_t = B_{t-1} (1 + r_t) + c_t is solved for all
+    paths at once as B_t = G_t (B_0 + sum_{s<=t} c_s / G_s), with G the
+    cumulative growth. Module-level so it can run on the process pool.
+    """
+    paths, months = params["paths"], params["months"]
+    rng = np.random.default_rng(params["seed"])
+    history = np.asarray(params["history"], dtype="float64")
+    monthly_return = (1.0 + params["annual_return"]) ** (1 / 12) - 1.0
+    growth = rng.normal(monthly_return, params["return_volatility"] / np.sqrt(12), size=(paths, months))
+    np.maximum(growth, -0.99, out=growth)
+    growth += 1.0
+    np.cumprod(growth, axis=1, out=growth)
+    # Built in place: contributions -> c / G -> cumulative sum -> balances.
+    balances = rng.choice(history, size=(paths, months)) if len(history) else np.zeros((paths, months))
+    balances /= growth
+    np.cumsum(balances, axis=1, out=balances)
+    balances += params["current_amount"]
+    balances *= growth
+    del growth
+
+    targets = params["target_amount"] * (1.0 + params["inflation"]) ** (np.arange(1, months + 1) / 12)
+    reached = balances >= targets
+    first_reached = np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, -1)
+    hit = first_reached[first_reached > 0]
+    bands = np.percentile(balances, PERCENTILES, axis=0)
+    return {
+        "probability": float(reached[:, -1].mean()),
+        "probability_reached_anytime": float(len(hit) / paths),
+        "median_months_to_goal": float(np.median(hit)) if len(hit) else None,
+        "final_target": float(targets[-1]),
+        "final_percentiles": {f"p{p}": float(value) for p, value in zip(PERCENTILES, bands[:, -1])},
+        "bands": np.round(bands.T, 2).tolist(),
+    }
+
+
+def months_between(start: date, end: date) -> int:
+    """Months from `start` until `end`, a partial month counting as a whole one; 0 once `end` has passed."""
+    if isinstance(end, datetime):
+        end = end.date()
+    if end <= start:
+        return 0
+    months = (end.year - start.year) * 12 + (end.month - start.month)
+    if end.day > start.day:
+        months += 1
+    return max(months, 1)
+
+
+def _input_key(params: dict) -> str:
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class GoalSimulationService:
+    @staticmethod
+    async def monthly_net_income(user_id: str, months: int, now: Optional[datetime] = None) -> List[float]:
+        """
+        Net income (income minus expenses) of each of the last `months` complete
+        months, read from the monthly rollups. Months before the user's first
+        transaction are left out; quiet months after it count as zero.
+        """
+        current = month_start(now or datetime.utcnow())
+        first = (pd.Timestamp(current) - pd.DateOffset(months=months)).strftime("%Y-%m")
+        buckets = await db.monthly_rollups.find(
+            {"user_id": user_id, "month": {"$gte": first, "$lt": current.strftime("%Y-%m")}},
+            {"_id": 0, "month": 1, "transaction_type": 1, "amount_cents": 1, "amount": 1},
+        ).to_list(None)
+        net = {}
+        for bucket in buckets:
+            sign = 1 if bucket["transaction_type"] == "income" else -1 if bucket["transaction_type"] == "expense" else 0
+            net[bucket["month"]] = net.get(bucket["month"], 0) + sign * bucket_cents(bucket)
+        if not net:
+            return []
+        calendar = pd.period_range(min(net), pd.Period(current, "M") - 1, freq="M").strftime("%Y-%m")
+        return [from_cents(net.get(month, 0)) for month in calendar]
+
+    @staticmethod
+    async def simulate_goal(
+        goal: dict,
+        months: int,
+        paths: int = 10000,
+        seed: Optional[int] = None,
+        annual_return: float = 0.03,
+        return_volatility: float = 0.05,
+        inflation: float = 0.02,
+        history_months: int = 24,
+    ) -> dict:
+        """
+        Probability of reaching `goal` within `months`, with percentile bands of
+        the projected balance. Results are cached by a hash of every input,
+        including the income history, so they refresh once new months land.
+        Without a seed, one is derived from that hash: the same inputs always
+        give the same answer.
+        """
+        history = await GoalSimulationService.monthly_net_income(goal["user_id"], history_months)
+        params = {
+            "history": history,
+            "current_amount": float(goal.get("current_amount") or 0.0),
+            "target_amount": float(goal["target_amount"]),
+            "months": months,
+            "paths": max(1, min(paths, SIMULATION_MAX_PATHS, SIMULATION_MAX_PATH_MONTHS // months)),
+            "annual_return": annual_return,
+            "return_volatility": return_volatility,
+            "inflation": inflation,
+            "seed": seed,
+        }
+        key = _input_key({**params, "goal_id": str(goal["_id"])})
+        cached = simulation_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if seed is None:
+            params["seed"] = int(key[:12], 16)  # 48 bits: exact as a JSON number
+        if params["paths"] * months >= SIMULATION_PROCESS_THRESHOLD:
+            outcome = await run_in_process(simulate, params)
+        else:
+            outcome = await asyncio.get_running_loop().run_in_executor(None, simulate, params)
+
+        start = pd.Period(datetime.utcnow(), "M")
+        bands = outcome.pop("bands")
+        result = {
+            "goal_id": str(goal["_id"]),
+            "months": months,
+            "paths": params["paths"],
+            "seed": params["seed"],
+            "history_months": len(history),
+            "mean_monthly_net_income": round(float(np.mean(history)), 2) if history else 0.0,
+            **outcome,
+            "bands": [
+                {"month": (start + offset).strftime("%Y-%m"), **{f"p{p}": value for p, value in zip(PERCENTILES, row)}}
+                for offset, row in enumerate(bands, start=1)
+            ],
+        }
+        simulation_cache.set(key, result)
+        return result
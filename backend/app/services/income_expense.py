@@ -1,4 +1,6 @@
 from app.database.mongo import db
+from app.services.transaction_analytics import TRANSACTION_TYPE
+from app.utils.money import AMOUNT_CENTS, from_cents
 from typing import List, Dict
 
 class IncomeExpenseService:
@@ -17,7 +19,11 @@ class IncomeExpenseService:
 
     @staticmethod
     async def summarize(user_id: str) -> Dict[str, float]:
-        transactions = await db.transactions.find({"user_id": user_id}).to_list(1000)
-        income = sum(t["amount"] for t in transactions if t["type"] == "income")
-        expense = sum(t["amount"] for t in transactions if t["type"] == "expense")
-        return {"total_income": income, "total_expense": expense, "net": income - expense}
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$group": {"_id": TRANSACTION_TYPE, "total": {"$sum": AMOUNT_CENTS}}},
+        ]
+        totals = {row["_id"]: row["total"] async for row in db.transactions.aggregate(pipeline)}
+        income = totals.get("income", 0)
+        expense = totals.get("expense", 0)
+        return {"total_income": from_cents(income), "total_expense": from_cents(expense), "net": from_cents(income - expense)}
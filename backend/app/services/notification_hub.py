@@ -0,0 +1,107 @@
+import asyncio
+import os
+from typing import Dict, Optional, Set
+from app.database.mongo import db
+
+NOTIFICATION_STREAM_QUEUE_SIZE = int(os.getenv("NOTIFICATION_STREAM_QUEUE_SIZE", "100"))
+# With several uvicorn workers a notification is written by one process but the
+# subscriber may be connected to another; the change stream (replica set only)
+# delivers every insert, update and delete to every worker's hub.
+NOTIFICATION_CHANGE_STREAM = os.getenv("NOTIFICATION_CHANGE_STREAM", "false").lower() in ("1", "true", "yes")
+
+
+class NotificationHub:
+    """
+    In-process pub/sub for live notifications. Each open stream owns a bounded
+    queue; when a slow client falls behind, its oldest pending events are dropped
+    rather than letting the queue grow. Idle subscribers cost no database work.
+    Queues carry (event, payload) pairs: `notification` for a new notification,
+    `update` for a changed one and `unread` when only the unread count moved.
+    """
+
+    _subscribers: Dict[str, Set[asyncio.Queue]] = {}
+    _feeder: Optional[asyncio.Task] = None
+    dropped = 0
+
+    @classmethod
+    def subscribe(cls, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=NOTIFICATION_STREAM_QUEUE_SIZE)
+        cls._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    @classmethod
+    def unsubscribe(cls, user_id: str, queue: asyncio.Queue) -> None:
+        queues = cls._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del cls._subscribers[user_id]
+
+    @classmethod
+    def publish(cls, payload: dict, event: str = "notification") -> None:
+        for queue in cls._subscribers.get(payload["user_id"], ()):
+            if queue.full():
+                queue.get_nowait()
+                cls.dropped += 1
+            queue.put_nowait((event, payload))
+
+    @classmethod
+    def publish_local(cls, payload: dict, event: str = "notification") -> None:
+        """Publish from the writing process, unless the change stream will deliver it."""
+        if not NOTIFICATION_CHANGE_STREAM:
+            cls.publish(payload, event)
+
+    @classmethod
+    def start(cls) -> None:
+        if NOTIFICATION_CHANGE_STREAM:
+            cls._feeder = asyncio.create_task(cls._watch())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._feeder:
+            cls._feeder.cancel()
+            await asyncio.gather(cls._feeder, return_exceptions=True)
+            cls._feeder = None
+
+    @classmethod
+    async def _watch(cls) -> None:
+        try:
+            # Delete events carry only the _id; pre-images (MongoDB 6.0+) tell
+            # whose unread count a deleted notification belonged to.
+            await db.command("collMod", "notifications", changeStreamPreAndPostImages={"enabled": True})
+        except Exception as exc:
+            print(f"⚠️  Notification pre-images unavailable, deletes will not reach other workers: {exc!r}")
+        resume_token = None
+        while True:
+            try:
+                async with db.notifications.watch(
+                    [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}],
+                    full_document="updateLookup",
+                    full_document_before_change="whenAvailable",
+                    resume_after=resume_token,
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        if change["operationType"] == "delete":
+                            deleted = change.get("fullDocumentBeforeChange")
+                            if deleted is not None and not deleted.get("read"):
+                                cls.publish({"user_id": deleted["user_id"]}, "unread")
+                        # An update's document is looked up afterwards and is
+                        # gone if it was deleted in between.
+                        elif change.get("fullDocument") is not None:
+                            event = "notification" if change["operationType"] == "insert" else "update"
+                            cls.publish(change["fullDocument"], event)
+            except Exception as exc:
+                # Anything escaping here would end the feeder for good and
+                # silently stop every worker's live notifications.
+                print(f"⚠️  Notification change stream interrupted: {exc!r}; restarting")
+                await asyncio.sleep(5)
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "users": len(cls._subscribers),
+            "streams": sum(len(queues) for queues in cls._subscribers.values()),
+            "dropped": cls.dropped,
+            "change_stream": NOTIFICATION_CHANGE_STREAM,
+        }
@@ -1,23 +1,127 @@
-from typing import Optional
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+from bson import ObjectId
+from pymongo import DESCENDING
 from app.database.mongo import db
+from app.services.notification_hub import NotificationHub
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, keyset_filter
+
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "1000"))
+# Per process: a write on one worker only invalidates that worker's entry, so
+# the TTL bounds how stale another worker's count can be.
+unread_cache = TTLCache(
+    maxsize=int(os.getenv("UNREAD_COUNT_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("UNREAD_COUNT_CACHE_TTL_SECONDS", "5")),
+)
+# One token per user whose count is being read; invalidation drops it, so a
+# count read before a concurrent write is never stored.
+_pending_counts: Dict[str, object] = {}
+
+def invalidate_unread(user_id: str) -> None:
+    unread_cache.pop(user_id)
+    _pending_counts.pop(user_id, None)
+
+def _document(user_id: str, message: str, created_at: datetime) -> dict:
+    return {
+        "user_id": user_id,
+        "message": message,
+        "created_at": created_at,
+        "read": False
+    }
 
 class NotifierService:
     @staticmethod
     async def send_notification(user_id: str, message: str) -> dict:
-        notification = {
-            "user_id": user_id,
-            "message": message,
-            "created_at": datetime.utcnow(),
-            "read": False
-        }
+        notification = _document(user_id, message, datetime.utcnow())
         result = await db.notifications.insert_one(notification)
+        invalidate_unread(user_id)
         notification["_id"] = str(result.inserted_id)
+        NotificationHub.publish_local(notification)
         return notification
 
+    @staticmethod
+    async def broadcast(user_ids: Iterable[str], message: str) -> int:
+        """Fan one message out to many users with unordered insert_many batches."""
+        created_at = datetime.utcnow()
+        sent = 0
+        batch: List[dict] = []
+        for user_id in dict.fromkeys(user_ids):
+            batch.append(_document(user_id, message, created_at))
+            if len(batch) >= NOTIFICATION_BATCH_SIZE:
+                sent += await NotifierService._insert(batch)
+                batch = []
+        if batch:
+            sent += await NotifierService._insert(batch)
+        return sent
+
+    @staticmethod
+    async def _insert(batch: List[dict]) -> int:
+        result = await db.notifications.insert_many(batch, ordered=False)
+        for notification in batch:
+            invalidate_unread(notification["user_id"])
+            NotificationHub.publish_local(notification)
+        return len(result.inserted_ids)
+
+    @staticmethod
+    async def unread_count(user_id: str) -> int:
+        """Unread total for the notification bell, served from the (user_id, read, created_at) index."""
+        count = unread_cache.get(user_id)
+        if count is None:
+            token = _pending_counts[user_id] = object()
+            try:
+                count = await db.notifications.count_documents({"user_id": user_id, "read": False})
+            finally:
+                current = _pending_counts.get(user_id) is token
+                if current:
+                    del _pending_counts[user_id]
+            if current:
+                unread_cache.set(user_id, count)
+        return count
+
+    @staticmethod
+    async def list_notifications(
+        user_id: str,
+        unread_only: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Newest first, one page at a time; returns the page and the cursor for the next one."""
+        query = {"user_id": user_id}
+        if unread_only:
+            query["read"] = False
+        keyset = keyset_filter("created_at", cursor)
+        if keyset:
+            query = {"$and": [query, keyset]}
+        notifications = await db.notifications.find(query).sort(
+            [("created_at", DESCENDING), ("_id", DESCENDING)]
+        ).limit(limit + 1).to_list(limit + 1)
+
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            last = notifications[-1]
+            next_cursor = encode_cursor(last["created_at"], last["_id"])
+        return notifications, next_cursor
+
     @staticmethod
     async def mark_as_read(notification_id: str) -> bool:
-        result = await db.notifications.update_one(
-            {"_id": notification_id}, {"$set": {"read": True}}
+        if not ObjectId.is_valid(notification_id):
+            return False
+        notification = await db.notifications.find_one_and_update(
+            {"_id": ObjectId(notification_id), "read": False}, {"$set": {"read": True}}
         )
-        return result.modified_count > 0
+        if notification is None:
+            return False
+        invalidate_unread(notification["user_id"])
+        NotificationHub.publish_local({**notification, "read": True}, "update")
+        return True
+
+    @staticmethod
+    async def mark_all_read(user_id: str) -> int:
+        result = await db.notifications.update_many({"user_id": user_id, "read": False}, {"$set": {"read": True}})
+        invalidate_unread(user_id)
+        if result.modified_count:
+            NotificationHub.publish_local({"user_id": user_id}, "unread")
+        return result.modified_count
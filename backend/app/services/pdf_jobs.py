@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from app.services.chart_renderer import ChartRendererService
+from app.utils.pdf_generator import render_financial_report_pdf
+from app.utils.process_pool import run_in_process
+
+PDF_JOB_WORKERS = int(os.getenv("PDF_JOB_WORKERS", "2"))
+PDF_JOB_QUEUE_SIZE = int(os.getenv("PDF_JOB_QUEUE_SIZE", "100"))
+PDF_JOB_RETENTION_SECONDS = int(os.getenv("PDF_JOB_RETENTION_SECONDS", "3600"))
+REPORTS_OUTPUT_DIR = os.getenv("REPORTS_OUTPUT_DIR", os.path.join(tempfile.gettempdir(), "investment_banking_reports"))
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class PdfJobService:
+    """
+    Bounded in-process queue of PDF render jobs.
+    Workers started from the app lifespan pull jobs, render on the shared
+    process pool and write the file under REPORTS_OUTPUT_DIR; callers poll
+    status and download once the job is done. Job state lives in the worker
+    process that accepted it.
+    """
+
+    jobs: Dict[str, dict] = {}
+    _queue: Optional[asyncio.Queue] = None
+    _workers: List[asyncio.Task] = []
+
+    @classmethod
+    def start(cls) -> None:
+        os.makedirs(REPORTS_OUTPUT_DIR, exist_ok=True)
+        cls._queue = asyncio.Queue(maxsize=PDF_JOB_QUEUE_SIZE)
+        cls._workers = [asyncio.create_task(cls._worker()) for _ in range(PDF_JOB_WORKERS)]
+        cls._workers.append(asyncio.create_task(cls._janitor()))
+
+    @classmethod
+    async def stop(cls) -> None:
+        for worker in cls._workers:
+            worker.cancel()
+        await asyncio.gather(*cls._workers, return_exceptions=True)
+        cls._workers = []
+
+    @classmethod
+    def enqueue(cls, user_id: str, report: dict) -> dict:
+        if cls._queue is None:
+            cls.start()
+        cls._prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "user_id": user_id,
+            "report_id": str(report["_id"]),
+            "status": "queued",
+            "progress": 0,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "finished_at": None,
+            "path": None,
+        }
+        try:
+            cls._queue.put_nowait((job, report))
+        except asyncio.QueueFull:
+            raise QueueFullError()
+        cls.jobs[job_id] = job
+        return job
+
+    @classmethod
+    def get(cls, job_id: str, user_id: str) -> Optional[dict]:
+        cls._prune()
+        job = cls.jobs.get(job_id)
+        if job is None or job["user_id"] != user_id:
+            return None
+        return job
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "workers": PDF_JOB_WORKERS,
+            "queued": cls._queue.qsize() if cls._queue else 0,
+            "max_queue": PDF_JOB_QUEUE_SIZE,
+            "running": sum(1 for job in cls.jobs.values() if job["status"] == "running"),
+        }
+
+    @classmethod
+    async def _worker(cls) -> None:
+        while True:
+            job, report = await cls._queue.get()
+            try:
+                await cls._render(job, report)
+            except Exception as exc:
+                job["status"] = "failed"
+                job["error"] = str(exc)
+            finally:
+                job["finished_at"] = datetime.utcnow()
+                cls._queue.task_done()
+
+    @staticmethod
+    async def _render(job: dict, report: dict) -> None:
+        job["status"] = "running"
+        summary = json.loads(report["report_data"])
+        title = f"{report['report_type'].title()} Financial Report"
+
+        chart = None
+        trend = summary.get("monthly_trend", [])
+        if trend:
+            _, chart = await ChartRendererService.expense_bar_chart(
+                [{"month": row["month"], "amount": row["expense"]} for row in trend]
+            )
+        job["progress"] = 40
+
+        path = os.path.join(REPORTS_OUTPUT_DIR, f"{job['job_id']}.pdf")
+        await run_in_process(render_financial_report_pdf, path, title, summary, chart)
+        job.update(status="done", progress=100, path=path)
+
+    @classmethod
+    async def _janitor(cls) -> None:
+        # Expired jobs and their files go even when no new job arrives.
+        while True:
+            await asyncio.sleep(max(1, min(PDF_JOB_RETENTION_SECONDS, 300)))
+            cls._prune()
+
+    @classmethod
+    def _prune(cls) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=PDF_JOB_RETENTION_SECONDS)
+        for job_id, job in list(cls.jobs.items()):
+            if job["finished_at"] and job["finished_at"] < cutoff:
+                if job["path"] and os.path.exists(job["path"]):
+                    os.remove(job["path"])
+                del cls.jobs[job_id]
@@ -0,0 +1,215 @@
+import os
+from datetime import date, datetime
+from typing import Callable, Literal, Optional
+import numpy as np
+import pandas as pd
+from app.services.portfolio_tracker import PortfolioTrackerService
+from app.utils.cache import TTLCache
+
+performance_cache = TTLCache(
+    maxsize=int(os.getenv("PERFORMANCE_CACHE_SIZE", "2000")),
+    ttl=float(os.getenv("PERFORMANCE_CACHE_TTL_SECONDS", "900")),
+)
+
+PerformanceWindow = Literal["1m", "3m", "6m", "ytd", "1y", "3y", "5y", "all"]
+WINDOW_MONTHS = {"1m": 1, "3m": 3, "6m": 6, "1y": 12, "3y": 36, "5y": 60}
+
+# The valuation series has one point per calendar day (prices are carried over
+# weekends and holidays), so returns annualize over 365 periods.
+DAYS_PER_YEAR = 365
+
+
+def invalidate_performance(user_id: Optional[str] = None) -> None:
+    if user_id is None:
+        performance_cache.clear()
+    else:
+        performance_cache.invalidate(lambda key, _: key[0] == user_id)
+
+
+def daily_returns(values: np.ndarray, flows: np.ndarray, opening: float = 0.0) -> np.ndarray:
+    """
+    Day-over-day returns with each day's contributions taken out:
+    (V_t - F_t) / V_{t-1} - 1. Days that start with nothing invested return 0.
+    """
+    previous = np.concatenate(([opening], values[:-1]))
+    return np.divide(values - flows - previous, previous, out=np.zeros_like(values), where=previous > 0)
+
+
+def time_weighted_return(returns: np.ndarray) -> float:
+    return float(np.prod(1.0 + returns) - 1.0)
+
+
+def annualize(total_return: float, days: int) -> Optional[float]:
+    if days <= 0 or total_return <= -1.0:
+        return None
+    return float((1.0 + total_return) ** (DAYS_PER_YEAR / days) - 1.0)
+
+
+def volatility(returns: np.ndarray) -> float:
+    """Annualized standard deviation of daily returns."""
+    if len(returns) < 2:
+        return 0.0
+    return float(np.std(returns, ddof=1) * np.sqrt(DAYS_PER_YEAR))
+
+
+def max_drawdown(returns: np.ndarray) -> float:
+    """Deepest peak-to-trough fall of the growth index, as a negative fraction."""
+    if not len(returns):
+        return 0.0
+    growth = np.cumprod(1.0 + returns)
+    peaks = np.maximum.accumulate(np.concatenate(([1.0], growth)))[1:]
+    return float(np.min(growth / peaks - 1.0))
+
+
+def _brent(f: Callable[[float], float], a: float, b: float, tol: float = 1e-12, max_iter: int = 200) -> Optional[float]:
+    """Brent's root finder on a bracketing interval [a, b]; None when f(a) and f(b) share a sign."""
+    fa, fb = f(a), f(b)
+    if fa * fb > 0:
+        return None
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc, d, bisected = a, fa, a, True
+    for _ in range(max_iter):
+        if fb == 0 or abs(b - a) < tol:
+            return b
+        if fa != fc and fb != fc:
+            s = (a * fb * fc / ((fa - fb) * (fa - fc))
+                 + b * fa * fc / ((fb - fa) * (fb - fc))
+                 + c * fa * fb / ((fc - fa) * (fc - fb)))
+        else:
+            s = b - fb * (b - a) / (fb - fa)
+        low, high = sorted(((3 * a + b) / 4, b))
+        if (not low < s < high
+                or (bisected and abs(s - b) >= abs(b - c) / 2)
+                or (not bisected and abs(s - b) >= abs(c - d) / 2)
+                or (bisected and abs(b - c) < tol)
+                or (not bisected and abs(c - d) < tol)):
+            s, bisected = (a + b) / 2, True
+        else:
+            bisected = False
+        fs = f(s)
+        d, c, fc = c, b, fb
+        if fa * fs < 0:
+            b, fb = s, fs
+        else:
+            a, fa = s, fs
+        if abs(fa) < abs(fb):
+            a, b, fa, fb = b, a, fb, fa
+    return b
+
+
+def irr(amounts: np.ndarray, days: np.ndarray) -> Optional[float]:
+    """
+    Annual money-weighted return: the rate at which the cash flows' net present
+    value is zero. `amounts` are negative for money put in and positive for
+    value taken out (or held at the end); `days` are offsets from the first
+    flow. Newton's method from 10%, falling back to Brent's method on a
+    bracket when Newton leaves the domain or does not converge.
+    """
+    mask = amounts != 0
+    amounts, years = amounts[mask], days[mask] / DAYS_PER_YEAR
+    if not (np.any(amounts > 0) and np.any(amounts < 0)):
+        return None
+
+    def npv(rate: float) -> float:
+        return float(np.sum(amounts * (1.0 + rate) ** -years))
+
+    rate = 0.1
+    for _ in range(50):
+        discount = (1.0 + rate) ** -years
+        value = np.sum(amounts * discount)
+        slope = np.sum(-years * amounts * discount / (1.0 + rate))
+        if slope == 0:
+            break
+        step = value / slope
+        rate -= step
+        if rate <= -1.0 or not np.isfinite(rate):
+            break
+        if abs(step) < 1e-10:
+            return float(rate)
+
+    low, high = -0.999999, 1.0
+    while npv(low) * npv(high) > 0 and high < 1e6:
+        high *= 10
+    return _brent(npv, low, high)
+
+
+def window_start(window: str, as_of: date, first: date) -> date:
+    if window == "all":
+        return first
+    if window == "ytd":
+        return date(as_of.year, 1, 1)
+    return (pd.Timestamp(as_of) - pd.DateOffset(months=WINDOW_MONTHS[window])).date()
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 6)
+
+
+class PerformanceService:
+    @staticmethod
+    async def performance(user_id: str, window: PerformanceWindow = "1y", as_of: Optional[date] = None) -> dict:
+        """
+        Time-weighted and money-weighted (IRR) returns, annualized volatility and
+        maximum drawdown of the user's open holdings over `window`, from the
+        cached daily valuation series. Purchases are the external cash flows.
+        Results are cached per (user, window, as-of date).
+        """
+        as_of = as_of or datetime.utcnow().date()
+        key = (user_id, window, as_of.isoformat())
+        cached = performance_cache.get(key)
+        if cached is not None:
+            return cached
+
+        valuation = await PortfolioTrackerService.valuation(user_id, as_of)
+        result = {
+            "window": window,
+            "start": None,
+            "end": as_of.isoformat(),
+            "time_weighted_return": None,
+            "annualized_return": None,
+            "irr": None,
+            "volatility": None,
+            "max_drawdown": None,
+            "series": [],
+        }
+        series = valuation["series"]
+        if series:
+            days = np.array([row["date"] for row in series], dtype="datetime64[D]")
+            values = np.array([row["value"] for row in series], dtype="float64")
+            flows = np.zeros_like(values)
+            purchased = np.array([holding["date"] for holding in valuation["holdings"]], dtype="datetime64[D]")
+            np.add.at(
+                flows,
+                (purchased - days[0]).astype("int64"),
+                [holding["cost_basis"] for holding in valuation["holdings"]],
+            )
+
+            start = np.datetime64(window_start(window, as_of, days[0].item()), "D")
+            first = int(np.searchsorted(days, start))
+            if first < len(days):
+                opening = values[first - 1] if first else 0.0
+                days, values, flows = days[first:], values[first:], flows[first:]
+                returns = daily_returns(values, flows, opening)
+                twr = time_weighted_return(returns)
+                # IRR flows: the opening value goes in the day before the window,
+                # purchases go in on their day, the closing value comes out.
+                amounts = np.concatenate(([-opening], -flows))
+                amounts[-1] += values[-1]
+                growth = np.cumprod(1.0 + returns)
+                result.update({
+                    "start": str(days[0]),
+                    "time_weighted_return": _round(twr),
+                    "annualized_return": _round(annualize(twr, len(returns))),
+                    "irr": _round(irr(amounts, np.arange(len(amounts), dtype="float64"))),
+                    "volatility": _round(volatility(returns)),
+                    "max_drawdown": _round(max_drawdown(returns)),
+                    "series": [
+                        {"date": day, "value": value, "growth": index}
+                        for day, value, index in zip(
+                            days.astype(str).tolist(), values.tolist(), np.round(growth, 6).tolist()
+                        )
+                    ],
+                })
+        performance_cache.set(key, result)
+        return result
@@ -1,12 +1,137 @@
+import os
+from datetime import date, datetime, time
+from typing import List, Optional
+import numpy as np
+import pandas as pd
 from app.database.mongo import db
-from typing import List
+from app.services.prices import PriceStore
+from app.utils.cache import TTLCache
+
+valuation_cache = TTLCache(
+    maxsize=int(os.getenv("VALUATION_CACHE_SIZE", "2000")),
+    ttl=float(os.getenv("VALUATION_CACHE_TTL_SECONDS", "900")),
+)
+
+HOLDING_FIELDS = {"_id": 1, "type": 1, "symbol": 1, "quantity": 1, "amount": 1, "date": 1}
+CLOSED_STATUSES = ["sold", "matured"]
+
+
+def invalidate_valuations(user_id: Optional[str] = None) -> None:
+    """Drop cached valuations for one user, or all of them after new prices load."""
+    if user_id is None:
+        valuation_cache.clear()
+    else:
+        valuation_cache.invalidate(lambda key, _: key[0] == user_id)
+
+
+def _empty_valuation(as_of: date) -> dict:
+    return {
+        "as_of": as_of.isoformat(),
+        "market_value": 0.0,
+        "cost_basis": 0.0,
+        "unrealized_pnl": 0.0,
+        "holdings": [],
+        "series": [],
+    }
+
+
+def _value(holdings: pd.DataFrame, closes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Daily value per position column. Quantities and cost accumulate from each
+    purchase date; a priced position is quantity x close, anything without a
+    price yet (or without a symbol) is carried at cost.
+    """
+    days = closes.index
+    cost = holdings.pivot_table(index="date", columns="position", values="amount", aggfunc="sum", fill_value=0.0)
+    cost = cost.reindex(days, fill_value=0.0).cumsum()
+    priced = holdings[holdings["priced"]]
+    if priced.empty:
+        return cost
+    quantity = priced.pivot_table(index="date", columns="position", values="quantity", aggfunc="sum", fill_value=0.0)
+    quantity = quantity.reindex(days, fill_value=0.0).cumsum()
+    prices = closes.reindex(columns=quantity.columns)
+    market = quantity * prices
+    cost.loc[:, quantity.columns] = np.where(prices.isna(), cost[quantity.columns], market)
+    return cost
+
 
 class PortfolioTrackerService:
+    @staticmethod
+    async def valuation(user_id: str, as_of: Optional[date] = None) -> dict:
+        """
+        Market value, cost basis and unrealized P&L per holding plus the daily
+        portfolio value series up to `as_of`, computed column-wise over a
+        (day x symbol) price frame. Results are cached per (user, as-of date).
+        Holdings with a symbol and quantity are priced from the local price
+        store; others are carried at cost.
+        """
+        as_of = as_of or datetime.utcnow().date()
+        key = (user_id, as_of.isoformat())
+        cached = valuation_cache.get(key)
+        if cached is not None:
+            return cached
+
+        end = datetime.combine(as_of, time.max)
+        investments = await db.investments.find(
+            {"user_id": user_id, "status": {"$nin": CLOSED_STATUSES}, "date": {"$lte": end}}, HOLDING_FIELDS
+        ).to_list(None)
+        if not investments:
+            result = _empty_valuation(as_of)
+            valuation_cache.set(key, result)
+            return result
+
+        holdings = pd.DataFrame(investments, columns=list(HOLDING_FIELDS))
+        holdings["date"] = pd.to_datetime(holdings["date"]).dt.normalize()
+        holdings["amount"] = holdings["amount"].astype("float64").fillna(0.0)
+        holdings["quantity"] = pd.to_numeric(holdings["quantity"], errors="coerce")
+        holdings["symbol"] = holdings["symbol"].astype(object).str.strip().str.upper().where(holdings["symbol"].notna(), None)
+        holdings["priced"] = holdings["symbol"].notna() & holdings["quantity"].notna()
+        # Priced holdings aggregate per symbol; unpriced ones each stand alone at cost.
+        holdings["position"] = holdings["symbol"].where(holdings["priced"], holdings["_id"].astype(str))
+
+        closes = await PriceStore.history(
+            holdings.loc[holdings["priced"], "symbol"], holdings["date"].min().to_pydatetime(), end
+        )
+        last = closes.iloc[-1] if len(closes) else pd.Series(dtype="float64")
+        price = holdings["symbol"].map(last) if len(last) else pd.Series(np.nan, index=holdings.index)
+        has_price = holdings["priced"] & price.notna()
+        holdings["price"] = price.where(has_price)
+        holdings["market_value"] = np.where(has_price, holdings["quantity"] * price, holdings["amount"])
+        holdings["unrealized_pnl"] = holdings["market_value"] - holdings["amount"]
+
+        series = _value(holdings, closes).sum(axis=1)
+        market_value = float(holdings["market_value"].sum())
+        cost_basis = float(holdings["amount"].sum())
+        result = {
+            "as_of": as_of.isoformat(),
+            "market_value": round(market_value, 2),
+            "cost_basis": round(cost_basis, 2),
+            "unrealized_pnl": round(market_value - cost_basis, 2),
+            "holdings": [
+                {
+                    "id": str(row["_id"]),
+                    "type": row["type"],
+                    "symbol": row["symbol"] if isinstance(row["symbol"], str) else None,
+                    "quantity": None if pd.isna(row["quantity"]) else float(row["quantity"]),
+                    "date": row["date"].date().isoformat(),
+                    "cost_basis": round(float(row["amount"]), 2),
+                    "price": None if pd.isna(row["price"]) else float(row["price"]),
+                    "market_value": round(float(row["market_value"]), 2),
+                    "unrealized_pnl": round(float(row["unrealized_pnl"]), 2),
+                }
+                for row in holdings.to_dict("records")
+            ],
+            "series": [
+                {"date": day.date().isoformat(), "value": round(float(value), 2)}
+                for day, value in series.items()
+            ],
+        }
+        valuation_cache.set(key, result)
+        return result
+
     @staticmethod
     async def get_total_investment_value(user_id: str) -> float:
-        investments = await db.investments.find({"user_id": user_id}).to_list(100)
-        total = sum(inv.get("amount", 0) for inv in investments)
-        return round(total, 2)
+        return (await PortfolioTrackerService.valuation(user_id))["market_value"]
 
     @staticmethod
     async def list_investments(user_id: str) -> List[dict]:
@@ -0,0 +1,151 @@
+import csv
+import io
+import os
+from datetime import datetime
+from typing import Iterable, List, Optional, TextIO
+import pandas as pd
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+from app.database.mongo import db
+
+PRICE_BATCH_SIZE = int(os.getenv("PRICE_BATCH_SIZE", "5000"))
+
+DATE_COLUMNS = ("date", "timestamp", "time")
+PRICE_COLUMNS = ("adj close", "adj_close", "close", "price")
+
+
+class PriceStoreError(Exception):
+    pass
+
+
+def _column(header: List[str], names: Iterable[str]) -> Optional[int]:
+    lowered = [name.strip().lower() for name in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    return None
+
+
+def parse_price_csv(handle: TextIO, symbol: Optional[str] = None) -> List[dict]:
+    """
+    Parse a daily price history export (date plus close or adjusted close) into
+    price documents. A `symbol` column wins over the `symbol` argument, so both
+    one-file-per-ticker and combined exports load.
+    """
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if not header:
+        return []
+    date_index = _column(header, DATE_COLUMNS)
+    price_index = _column(header, PRICE_COLUMNS)
+    symbol_index = _column(header, ("symbol", "ticker"))
+    if date_index is None or price_index is None:
+        raise ValueError("Price files need a date column and a close/price column")
+    if symbol_index is None and not symbol:
+        raise ValueError("Price files without a symbol column need an explicit symbol")
+
+    required = max(index for index in (date_index, price_index, symbol_index) if index is not None)
+    prices = []
+    for row in reader:
+        if len(row) <= required or not row[price_index].strip():
+            continue
+        row_symbol = (row[symbol_index].strip() if symbol_index is not None else "") or symbol
+        if not row_symbol:
+            continue
+        try:
+            close = float(row[price_index])
+        except ValueError:
+            continue  # "null" rows in exchange exports
+        prices.append({
+            "symbol": row_symbol.strip().upper(),
+            "date": datetime.fromisoformat(row[date_index].strip()[:10]),
+            "close": close,
+        })
+    return prices
+
+
+class PriceStore:
+    """
+    Local price history in the `prices` time-series collection (one document per
+    symbol and day). Loaded from CSV files, so valuations never need the network.
+    """
+
+    @staticmethod
+    async def load(prices: List[dict]) -> int:
+        """Replace the stored history covered by `prices` and insert it in batches."""
+        if not prices:
+            return 0
+        frame = pd.DataFrame(prices)
+        for symbol, rows in frame.groupby("symbol"):
+            try:
+                await db.prices.delete_many({
+                    "symbol": symbol,
+                    "date": {"$gte": rows["date"].min().to_pydatetime(), "$lte": rows["date"].max().to_pydatetime()},
+                })
+            except OperationFailure as exc:
+                # Time-series deletes filtering on `date` (not the metaField)
+                # need MongoDB 7.0; older servers reject them.
+                raise PriceStoreError(
+                    f"Could not replace stored prices for {symbol} (MongoDB 7.0+ is required): {exc}"
+                ) from exc
+        for start in range(0, len(prices), PRICE_BATCH_SIZE):
+            await db.prices.insert_many(prices[start:start + PRICE_BATCH_SIZE], ordered=False)
+        return len(prices)
+
+    @staticmethod
+    async def load_csv(content: str, symbol: Optional[str] = None) -> int:
+        return await PriceStore.load(parse_price_csv(io.StringIO(content), symbol))
+
+    @staticmethod
+    async def history(symbols: Iterable[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Daily closes as a (calendar day x symbol) frame, forward-filled over
+        weekends and holidays. Prices from before `start` seed the first row so a
+        holding bought on a non-trading day still has a value.
+        """
+        symbols = sorted(set(symbols))
+        days = pd.date_range(start.date(), end.date(), freq="D")
+        if not symbols:
+            return pd.DataFrame(index=days)
+
+        seeds = await db.prices.aggregate([
+            {"$match": {"symbol": {"$in": symbols}, "date": {"$lt": start}}},
+            {"$sort": {"date": -1}},
+            {"$group": {"_id": "$symbol", "date": {"$first": "$date"}, "close": {"$first": "$close"}}},
+            {"$project": {"_id": 0, "symbol": "$_id", "date": 1, "close": 1}},
+        ]).to_list(None)
+        rows = await db.prices.find(
+            {"symbol": {"$in": symbols}, "date": {"$gte": start, "$lte": end}},
+            {"_id": 0, "symbol": 1, "date": 1, "close": 1},
+        ).sort("date", ASCENDING).to_list(None)
+
+        frame = pd.DataFrame(seeds + rows, columns=["symbol", "date", "close"])
+        if frame.empty:
+            return pd.DataFrame(index=days, columns=symbols, dtype="float64")
+        frame["date"] = pd.to_datetime(frame["date"]).dt.normalize()
+        closes = frame.pivot_table(index="date", columns="symbol", values="close", aggfunc="last")
+        closes = closes.reindex(closes.index.union(days)).sort_index().ffill()
+        return closes.reindex(index=days, columns=symbols)
+
+
+if __name__ == "__main__":
+    # python -m app.services.prices prices/AAPL.csv prices/combined.csv ...
+    # The file stem is used as the symbol when a file has no symbol column.
+    import asyncio
+    import sys
+    from app.database import mongo
+    from app.database.indexes import ensure_indexes
+
+    async def main(paths: List[str]) -> None:
+        mongo.connect()
+        try:
+            await ensure_indexes()
+            for path in paths:
+                with open(path, newline="") as handle:
+                    symbol = os.path.splitext(os.path.basename(path))[0]
+                    count = await PriceStore.load(parse_price_csv(handle, symbol))
+                print(f"{path}: {count} prices")
+        finally:
+            mongo.close()
+
+    asyncio.run(main(sys.argv[1:]))
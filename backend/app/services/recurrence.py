@@ -0,0 +1,240 @@
+import asyncio
+import calendar
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.database.mongo import db
+from app.services.rollups import MonthlyRollupService
+
+RECURRENCE_INTERVAL_SECONDS = float(os.getenv("RECURRENCE_INTERVAL_SECONDS", "300"))
+RECURRENCE_LEASE_SECONDS = float(os.getenv("RECURRENCE_LEASE_SECONDS", "600"))
+RECURRENCE_BATCH_SIZE = int(os.getenv("RECURRENCE_BATCH_SIZE", "500"))
+# Caps the backfill for one template per run; the rest is picked up next run.
+RECURRENCE_MAX_OCCURRENCES = int(os.getenv("RECURRENCE_MAX_OCCURRENCES", "366"))
+
+LEASE_ID = "recurrence"
+
+FREQUENCIES = {
+    "daily": ("days", 1),
+    "weekly": ("days", 7),
+    "biweekly": ("days", 14),
+    "monthly": ("months", 1),
+    "quarterly": ("months", 3),
+    "yearly": ("months", 12),
+    "annually": ("months", 12),
+}
+
+# Fields copied from a template onto each materialized occurrence.
+COPIED_FIELDS = ("user_id", "amount", "amount_cents", "description", "category", "transaction_type", "type")
+
+
+def occurrence(anchor: datetime, frequency: str, index: int) -> datetime:
+    """
+    The `index`-th occurrence after `anchor`. Month steps are always taken from
+    the anchor, so a series starting on the 31st lands on the 30th/28th/29th in
+    shorter months and returns to the 31st afterwards.
+    """
+    unit, step = FREQUENCIES[frequency]
+    if unit == "days":
+        return anchor + timedelta(days=step * index)
+    months = anchor.month - 1 + step * index
+    year, month = anchor.year + months // 12, months % 12 + 1
+    return anchor.replace(year=year, month=month, day=min(anchor.day, calendar.monthrange(year, month)[1]))
+
+
+def rewatermark(before: dict, after: dict) -> Optional[dict]:
+    """
+    Watermark fields to $set when an update changes a template's schedule
+    (anchor date, frequency or recurring flag), or None when it does not. The
+    new series resumes after the last occurrence already materialized under
+    the old one, so a change neither replays nor skips the covered period.
+    """
+    schedule = ("date", "recurring_frequency", "is_recurring")
+    if all(before.get(field) == after.get(field) for field in schedule):
+        return None
+    anchor, frequency = after.get("date"), after.get("recurring_frequency")
+    if not after.get("is_recurring") or frequency not in FREQUENCIES or not isinstance(anchor, datetime):
+        return {"recurrence_index": None, "recurrence_next": None}
+
+    covered_until = None
+    previous_index = before.get("recurrence_index") or 1
+    if previous_index > 1 and before.get("recurring_frequency") in FREQUENCIES:
+        covered_until = occurrence(before["date"], before["recurring_frequency"], previous_index - 1)
+    index = 1
+    while covered_until is not None and occurrence(anchor, frequency, index) <= covered_until:
+        index += 1
+    return {"recurrence_index": index, "recurrence_next": occurrence(anchor, frequency, index)}
+
+
+def _due_query(now: datetime) -> dict:
+    return {
+        "is_recurring": True,
+        "recurring_frequency": {"$in": list(FREQUENCIES)},
+        "recurrence_source_id": {"$exists": False},
+        "date": {"$type": "date"},
+        "$or": [{"recurrence_next": {"$lte": now}}, {"recurrence_next": None}],
+    }
+
+
+def _expand(template: dict, now: datetime) -> Tuple[List[dict], UpdateOne]:
+    """Build the template's occurrences due by `now` and the update advancing its watermark."""
+    frequency = template["recurring_frequency"]
+    anchor = template["date"]
+    first = index = template.get("recurrence_index") or 1
+    dates = []
+    current = occurrence(anchor, frequency, index)
+    while current <= now and len(dates) < RECURRENCE_MAX_OCCURRENCES:
+        dates.append(current)
+        index += 1
+        current = occurrence(anchor, frequency, index)
+
+    created_at = datetime.utcnow()
+    source_id = str(template["_id"])
+    documents = [
+        {
+            **{field: template[field] for field in COPIED_FIELDS if field in template},
+            "date": date,
+            "is_recurring": False,
+            "recurring_frequency": None,
+            "recurrence_source_id": source_id,
+            "created_at": created_at,
+            "updated_at": None,
+        }
+        for date in dates
+    ]
+    # Never move a watermark backwards if an overlapping run got further, and
+    # drop the update if the schedule was edited while this run expanded it.
+    watermark = UpdateOne(
+        {
+            "_id": template["_id"],
+            "date": anchor,
+            "recurring_frequency": frequency,
+            "$or": [{"recurrence_index": None}, {"recurrence_index": {"$lte": first}}],
+        },
+        {"$set": {"recurrence_index": index, "recurrence_next": current}},
+    )
+    return documents, watermark
+
+
+class RecurrenceScheduler:
+    """
+    Expands recurring transaction templates into concrete transactions.
+    Each template carries its own watermark (`recurrence_index` /
+    `recurrence_next`), so a run only reads templates with occurrences due since
+    the last one. Across workers a Mongo lease lets a single process run at a
+    time, and the unique (recurrence_source_id, date) index keeps runs
+    idempotent even if a lease expires mid-run and two overlap.
+    """
+
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def start(cls) -> None:
+        if RECURRENCE_INTERVAL_SECONDS > 0:
+            cls._task = asyncio.create_task(cls._loop())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task:
+            cls._task.cancel()
+            await asyncio.gather(cls._task, return_exceptions=True)
+            cls._task = None
+
+    @classmethod
+    async def _loop(cls) -> None:
+        while True:
+            try:
+                created = await cls.run_once()
+                if created:
+                    print(f"🔁 Materialized {created} recurring transactions")
+            except Exception as exc:
+                print(f"⚠️  Recurring transaction run failed: {exc}")
+            await asyncio.sleep(RECURRENCE_INTERVAL_SECONDS)
+
+    @classmethod
+    async def run_once(cls, now: Optional[datetime] = None) -> Optional[int]:
+        """Materialize everything due up to `now`; returns None when another worker holds the lease."""
+        now = now or datetime.utcnow()
+        if not await cls._acquire(now):
+            return None
+        try:
+            created = 0
+            cursor = db.transactions.find(_due_query(now)).batch_size(RECURRENCE_BATCH_SIZE)
+            documents: List[dict] = []
+            watermarks: List[UpdateOne] = []
+            async for template in cursor:
+                occurrences, watermark = _expand(template, now)
+                documents.extend(occurrences)
+                watermarks.append(watermark)
+                if len(documents) >= RECURRENCE_BATCH_SIZE:
+                    created += await cls._flush(documents, watermarks)
+                    documents, watermarks = [], []
+                    if not await cls._renew():
+                        print("⚠️  Recurrence lease lost mid-run; leaving the rest to its holder")
+                        return created
+            if watermarks:
+                created += await cls._flush(documents, watermarks)
+            return created
+        finally:
+            await db.scheduler_leases.update_one(
+                {"_id": LEASE_ID, "owner": cls.owner}, {"$set": {"expires_at": datetime.utcnow()}}
+            )
+
+    @classmethod
+    async def _acquire(cls, now: datetime) -> bool:
+        try:
+            lease = await db.scheduler_leases.find_one_and_update(
+                {"_id": LEASE_ID, "$or": [{"expires_at": {"$lte": now}}, {"owner": cls.owner}]},
+                {"$set": {"owner": cls.owner, "expires_at": now + timedelta(seconds=RECURRENCE_LEASE_SECONDS)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # The lease document exists and is held by someone else.
+            return False
+        return lease is not None and lease["owner"] == cls.owner
+
+    @classmethod
+    async def _renew(cls) -> bool:
+        """Extend the lease after each batch so a long backfill keeps it."""
+        result = await db.scheduler_leases.update_one(
+            {"_id": LEASE_ID, "owner": cls.owner},
+            {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=RECURRENCE_LEASE_SECONDS)}},
+        )
+        return result.matched_count == 1
+
+    @staticmethod
+    async def _flush(documents: List[dict], watermarks: List[UpdateOne]) -> int:
+        # Occurrences are written before the watermarks move, so a crash in
+        # between only means the next run re-inserts (and skips) duplicates.
+        failed = set()
+        if documents:
+            try:
+                await db.transactions.insert_many(documents, ordered=False)
+            except BulkWriteError as exc:
+                for error in exc.details.get("writeErrors", []):
+                    failed.add(error["index"])
+                    if error.get("code") != 11000:
+                        print(f"⚠️  Could not materialize recurring transaction: {error.get('errmsg')}")
+        written = [doc for index, doc in enumerate(documents) if index not in failed]
+        await MonthlyRollupService.apply_many(written)
+        await db.transactions.bulk_write(watermarks, ordered=False)
+        return len(written)
+
+if __name__ == "__main__":
+    # python -m app.services.recurrence  (one run, e.g. from cron)
+    from app.database import mongo
+
+    async def main() -> None:
+        mongo.connect()
+        try:
+            print(f"Materialized {await RecurrenceScheduler.run_once()} recurring transactions")
+        finally:
+            mongo.close()
+
+    asyncio.run(main())
@@ -0,0 +1,271 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from app.database.mongo import db
+from app.services.transaction_analytics import TRANSACTION_TYPE, MONTH_KEY, build_match, empty_summary
+from app.utils.money import AMOUNT_CENTS, from_cents, to_cents
+
+ROLLUP_FIELDS = ("user_id", "month", "category", "transaction_type")
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month_start(value: datetime) -> datetime:
+    start = month_start(value)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def rollup_key(transaction: dict) -> dict:
+    """Map a raw transaction document onto its (user, YYYY-MM, category, type) bucket."""
+    return {
+        "user_id": transaction["user_id"],
+        "month": transaction["date"].strftime("%Y-%m"),
+        "category": transaction.get("category") or "other",
+        "transaction_type": transaction.get("transaction_type") or transaction.get("type"),
+    }
+
+
+def amount_cents(document: dict) -> int:
+    cents = document.get("amount_cents")
+    return to_cents(document.get("amount", 0)) if cents is None else cents
+
+
+def bucket_cents(bucket: dict) -> int:
+    """
+    Cents held by a stored rollup bucket. Buckets from before integer cents hold
+    only a float `amount`, and the first `$inc` after the upgrade adds
+    `amount_cents` beside it, so until `migrate_money` rebuilds them a bucket's
+    total is the sum of both fields.
+    """
+    return (bucket.get("amount_cents") or 0) + to_cents(bucket.get("amount"))
+
+
+def _delta(transaction: dict, sign: int) -> Tuple[tuple, int, int]:
+    key = rollup_key(transaction)
+    return tuple(key[f] for f in ROLLUP_FIELDS), sign * amount_cents(transaction), sign
+
+
+def _with_amount(bucket: dict) -> dict:
+    # Buckets carry exact integer cents; `amount` is the derived float for display.
+    cents = amount_cents(bucket)
+    return {**bucket, "amount_cents": cents, "amount": from_cents(cents)}
+
+
+def _updates(deltas: Iterable[Tuple[tuple, int, int]]) -> List[UpdateOne]:
+    # Collapse deltas hitting the same bucket so a batch costs one write per bucket.
+    merged = {}
+    for key, amount, count in deltas:
+        total = merged.setdefault(key, [0, 0])
+        total[0] += amount
+        total[1] += count
+    now = datetime.utcnow()
+    return [
+        UpdateOne(
+            dict(zip(ROLLUP_FIELDS, key)),
+            {"$inc": {"amount_cents": amount, "count": count}, "$set": {"updated_at": now}},
+            upsert=True,
+        )
+        for key, (amount, count) in merged.items()
+        if count or amount
+    ]
+
+
+def _fold(buckets: Iterable[dict]) -> dict:
+    """Fold (month, category, transaction_type, amount) buckets into the FinancialSummary shape."""
+    total_income = total_expenses = 0
+    monthly, categories = {}, {}
+    seen = False
+    for bucket in buckets:
+        if not bucket.get("count"):
+            continue
+        seen = True
+        cents = amount_cents(bucket)
+        is_income = bucket["transaction_type"] == "income"
+        if is_income:
+            total_income += cents
+        elif bucket["transaction_type"] == "expense":
+            total_expenses += cents
+        column = "income" if is_income else "expense"
+        for rows, key in ((monthly, bucket["month"]), (categories, bucket["category"])):
+            rows.setdefault(key, {"income": 0, "expense": 0})[column] += cents
+
+    if not seen:
+        return empty_summary()
+
+    def rows(data: dict, label: str) -> List[dict]:
+        return [
+            {
+                label: key,
+                "income": from_cents(v["income"]),
+                "expense": from_cents(v["expense"]),
+                "net": from_cents(v["income"] - v["expense"]),
+            }
+            for key, v in data.items()
+        ]
+
+    net_income = from_cents(total_income - total_expenses)
+    total_income, total_expenses = from_cents(total_income), from_cents(total_expenses)
+    return {
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_income": net_income,
+        "savings_rate": (net_income / total_income * 100) if total_income > 0 else 0,
+        "monthly_trend": sorted(rows(monthly, "month"), key=lambda r: r["month"]),
+        "category_breakdown": rows(categories, "category"),
+    }
+
+
+class MonthlyRollupService:
+    """
+    Maintains the `monthly_rollups` collection: one document per
+    (user_id, month, category, transaction_type) holding the summed amount and count.
+    Write handlers apply deltas; analytics read whole months from here and only
+    touch raw transactions for partial months at the edges of a date range.
+    """
+
+    @staticmethod
+    async def apply(transaction: dict, sign: int = 1) -> None:
+        await MonthlyRollupService.apply_many([transaction], sign)
+
+    @staticmethod
+    async def apply_many(transactions: Iterable[dict], sign: int = 1) -> None:
+        updates = _updates(_delta(t, sign) for t in transactions)
+        if updates:
+            await db.monthly_rollups.bulk_write(updates, ordered=False)
+
+    @staticmethod
+    async def apply_change(before: dict, after: dict) -> None:
+        updates = _updates([_delta(before, -1), _delta(after, 1)])
+        if updates:
+            await db.monthly_rollups.bulk_write(updates, ordered=False)
+
+    @staticmethod
+    async def buckets(
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Return rollup buckets covering [start_date, end_date].
+        Whole months come from `monthly_rollups`; a partial first or last month is
+        aggregated from raw transactions so date-range semantics stay exact.
+        """
+        full_from, full_to = start_date, None
+        if start_date and start_date != month_start(start_date):
+            full_from = next_month_start(start_date)
+            if end_date and end_date < full_from:
+                # The whole range sits inside a single partial month.
+                return await MonthlyRollupService._raw_buckets(user_id, start_date, end_date, True, transaction_type)
+
+        buckets: List[dict] = []
+        if full_from != start_date:
+            buckets.extend(await MonthlyRollupService._raw_buckets(
+                user_id, start_date, full_from, False, transaction_type
+            ))
+        if end_date:
+            full_to = month_start(end_date)
+            buckets.extend(await MonthlyRollupService._raw_buckets(
+                user_id, full_to, end_date, True, transaction_type
+            ))
+
+        if full_from is None or full_to is None or full_from < full_to:
+            query: dict = {"user_id": user_id}
+            months = {}
+            if full_from:
+                months["$gte"] = full_from.strftime("%Y-%m")
+            if full_to:
+                months["$lt"] = full_to.strftime("%Y-%m")
+            if months:
+                query["month"] = months
+            if transaction_type:
+                query["transaction_type"] = transaction_type
+            stored = await db.monthly_rollups.find(query, {"_id": 0}).to_list(None)
+            buckets.extend({**bucket, "amount_cents": bucket_cents(bucket)} for bucket in stored)
+        return [_with_amount(bucket) for bucket in buckets]
+
+    @staticmethod
+    async def financial_summary(
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> dict:
+        return _fold(await MonthlyRollupService.buckets(user_id, start_date, end_date))
+
+    @staticmethod
+    async def _raw_buckets(
+        user_id: str,
+        start: datetime,
+        end: datetime,
+        inclusive: bool,
+        transaction_type: Optional[str],
+    ) -> List[dict]:
+        match = build_match(user_id, start, None, transaction_type)
+        match["date"]["$lte" if inclusive else "$lt"] = end
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": {
+                    "month": MONTH_KEY,
+                    "category": {"$ifNull": ["$category", "other"]},
+                    "transaction_type": TRANSACTION_TYPE,
+                },
+                "amount_cents": {"$sum": AMOUNT_CENTS},
+                "count": {"$sum": 1},
+            }},
+        ]
+        rows = await db.transactions.aggregate(pipeline).to_list(None)
+        return [
+            _with_amount({**row["_id"], "user_id": user_id, "amount_cents": row["amount_cents"], "count": row["count"]})
+            for row in rows
+        ]
+
+    @staticmethod
+    async def rebuild(user_id: Optional[str] = None) -> int:
+        """
+        Recompute rollups from raw transactions, for one user or for everyone.
+        Buckets are replaced in place by $merge on the rollup key, so readers
+        never see an emptied collection; buckets no transaction maps to any more
+        are removed afterwards. Buckets a live write created or touched during the
+        run are left alone.
+        """
+        scope = {"user_id": user_id} if user_id else {}
+        started = datetime.utcnow()
+        pipeline = [
+            {"$match": {"user_id": user_id or {"$exists": True}, "date": {"$type": "date"}}},
+            {"$group": {
+                "_id": {
+                    "user_id": "$user_id",
+                    "month": MONTH_KEY,
+                    "category": {"$ifNull": ["$category", "other"]},
+                    "transaction_type": TRANSACTION_TYPE,
+                },
+                "amount_cents": {"$sum": AMOUNT_CENTS},
+                "count": {"$sum": 1},
+            }},
+            {"$replaceRoot": {"newRoot": {"$mergeObjects": [
+                "$_id", {"amount_cents": "$amount_cents", "count": "$count", "updated_at": started}
+            ]}}},
+            {"$merge": {
+                "into": "monthly_rollups",
+                "on": list(ROLLUP_FIELDS),
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }},
+        ]
+        await db.transactions.aggregate(pipeline).to_list(None)
+        await db.monthly_rollups.delete_many({**scope, "updated_at": {"$not": {"$gte": started}}})
+        return await db.monthly_rollups.count_documents(scope)
+
+
+if __name__ == "__main__":
+    # Backfill: python -m app.services.rollups [user_id]
+    import asyncio
+    import sys
+
+    count = asyncio.run(MonthlyRollupService.rebuild(sys.argv[1] if len(sys.argv) > 1 else None))
+    print(f"Rebuilt {count} monthly rollup documents")
@@ -0,0 +1,50 @@
+import os
+from datetime import datetime
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from app.database.mongo import db
+from app.services.transaction_analytics import build_match
+from app.utils.pdf_generator import StatementWriter
+
+STATEMENT_BATCH_SIZE = int(os.getenv("STATEMENT_BATCH_SIZE", "1000"))
+
+STATEMENT_FIELDS = {"date": 1, "description": 1, "category": 1, "transaction_type": 1, "type": 1, "amount": 1, "amount_cents": 1}
+
+
+class StatementService:
+    @staticmethod
+    async def write_statement(
+        user_id: str,
+        path: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> int:
+        """
+        Write a paginated PDF statement to `path`, pulling transactions from the
+        cursor STATEMENT_BATCH_SIZE at a time so only one batch is held in memory;
+        finished pages go straight to the file. Drawing runs in the threadpool
+        between batches. Returns the row count.
+        """
+        period = "{} to {}".format(
+            start_date.strftime("%Y-%m-%d") if start_date else "beginning",
+            end_date.strftime("%Y-%m-%d") if end_date else datetime.utcnow().strftime("%Y-%m-%d"),
+        )
+        writer = await run_in_threadpool(StatementWriter, path, "Transaction Statement", period)
+        cursor = db.transactions.find(
+            build_match(user_id, start_date, end_date), STATEMENT_FIELDS
+        ).sort([("date", 1), ("_id", 1)]).batch_size(STATEMENT_BATCH_SIZE)
+
+        try:
+            batch = []
+            async for transaction in cursor:
+                batch.append(transaction)
+                if len(batch) >= STATEMENT_BATCH_SIZE:
+                    await run_in_threadpool(writer.write_rows, batch)
+                    batch = []
+            if batch:
+                await run_in_threadpool(writer.write_rows, batch)
+        except BaseException:
+            writer.abort()
+            raise
+        await run_in_threadpool(writer.close)
+        return writer.rows
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+
+# Documents written through /api/transactions use `transaction_type`, the ones
+# written through /api/income-expense use `type`; group on whichever is present.
+TRANSACTION_TYPE = {"$ifNull": ["$transaction_type", "$type"]}
+MONTH_KEY = {"$dateToString": {"format": "%Y-%m", "date": "$date"}}
+
+
+def build_match(
+    user_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+) -> dict:
+    match: dict = {"user_id": user_id}
+    date_range = {}
+    if start_date:
+        date_range["$gte"] = start_date
+    if end_date:
+        date_range["$lte"] = end_date
+    if date_range:
+        match["date"] = date_range
+    if transaction_type:
+        match["$or"] = [{"transaction_type": transaction_type}, {"type": transaction_type}]
+    return match
+
+
+def empty_summary() -> dict:
+    return {
+        "total_income": 0,
+        "total_expenses": 0,
+        "net_income": 0,
+        "savings_rate": 0,
+        "monthly_trend": [],
+        "category_breakdown": [],
+    }
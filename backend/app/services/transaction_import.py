@@ -0,0 +1,85 @@
+import os
+from datetime import datetime
+from typing import AsyncIterator, List
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from app.database.mongo import db
+from app.services.rollups import MonthlyRollupService
+from app.utils.money import with_cents
+from app.utils.schemas import TransactionCreate
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "500"))
+
+
+def transaction_document(user_id: str, transaction: TransactionCreate) -> dict:
+    now = datetime.utcnow()
+    return with_cents({
+        "user_id": user_id,
+        "amount": transaction.amount,
+        "description": transaction.description,
+        "category": transaction.category.value,
+        "transaction_type": transaction.transaction_type.value,
+        "date": transaction.date or now,
+        "is_recurring": transaction.is_recurring,
+        "recurring_frequency": transaction.recurring_frequency,
+        "created_at": now,
+        "updated_at": None
+    })
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class TransactionImportService:
+    @staticmethod
+    async def import_rows(user_id: str, rows: AsyncIterator[dict]) -> dict:
+        """
+        Validate rows against TransactionCreate and insert them in unordered
+        batches of IMPORT_BATCH_SIZE. Rollups are updated once per batch from the
+        documents that were actually written. Rows are numbered from 1 in the
+        returned error list, which is capped at IMPORT_MAX_REPORTED_ERRORS.
+        """
+        result = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+
+        def reject(row_number: int, message: str) -> None:
+            result["failed"] += 1
+            if len(result["errors"]) < IMPORT_MAX_REPORTED_ERRORS:
+                result["errors"].append({"row": row_number, "error": message})
+
+        batch: List[dict] = []
+        numbers: List[int] = []
+        async for row in rows:
+            result["received"] += 1
+            try:
+                if not isinstance(row, dict):
+                    raise TypeError("Expected an object")
+                batch.append(transaction_document(user_id, TransactionCreate(**row)))
+                numbers.append(result["received"])
+            except ValidationError as exc:
+                reject(result["received"], _describe(exc))
+            except (TypeError, ValueError) as exc:
+                reject(result["received"], str(exc))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                result["inserted"] += await TransactionImportService._flush(batch, numbers, reject)
+                batch, numbers = [], []
+        if batch:
+            result["inserted"] += await TransactionImportService._flush(batch, numbers, reject)
+        return result
+
+    @staticmethod
+    async def _flush(batch: List[dict], numbers: List[int], reject) -> int:
+        failed = set()
+        try:
+            await db.transactions.insert_many(batch, ordered=False)
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                failed.add(error["index"])
+                reject(numbers[error["index"]], error.get("errmsg", "Write failed"))
+        written = [doc for index, doc in enumerate(batch) if index not in failed]
+        await MonthlyRollupService.apply_many(written)
+        return len(written)
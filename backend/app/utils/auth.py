@@ -2,12 +2,13 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.utils.password_hashing import run_hashing
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database.database import get_db
 from app.database.models import User
+from app.utils.cache import TTLCache
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,6 +18,14 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Resolved principals, keyed by bearer token; entries never outlive the token.
+# The cache is per worker process: invalidate_user_cache only reaches the
+# worker that handled the change, so other workers may serve the old user
+# (e.g. still active) for up to AUTH_CACHE_TTL_SECONDS.
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+principal_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -29,6 +38,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_hashing(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_hashing(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -39,19 +54,25 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
+def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
     except JWTError:
         return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+def verify_token(token: str) -> Optional[str]:
+    payload = decode_token(token)
+    return payload["sub"] if payload else None
+
+def invalidate_user_cache(username: str) -> int:
+    """Forget cached principals for a user after their account changes."""
+    return principal_cache.invalidate(lambda token, user: user.username == username)
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,14 +81,22 @@ async def get_current_user(
     )
     
     token = credentials.credentials
-    username = verify_token(token)
-    if username is None:
+    payload = decode_token(token)
+    if payload is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
+    # Requests get their own copy: handlers mutate the user before save().
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+    
+    user = await User.find_one(User.username == payload["sub"])
     if user is None:
         raise credentials_exception
     
+    expires = payload.get("exp")
+    ttl = expires - time.time() if expires is not None else None
+    principal_cache.set(token, user.model_copy(deep=True), ttl=ttl)
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -1,23 +1,26 @@
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import io
 from typing import List, Dict
 
 def generate_expense_bar_chart(expenses: List[Dict[str, float]]) -> bytes:
     """
     Generate a bar chart for monthly expenses.
+    Uses a standalone Figure on the Agg canvas rather than the pyplot state
+    machine, so concurrent renders in different threads/processes don't share state.
     :param expenses: List of dicts with 'month' and 'amount' keys
     :return: PNG image bytes
     """
     months = [item['month'] for item in expenses]
     amounts = [item['amount'] for item in expenses]
-    plt.figure(figsize=(8, 4))
-    plt.bar(months, amounts, color='skyblue')
-    plt.xlabel('Month')
-    plt.ylabel('Amount ($)')
-    plt.title('Monthly Expenses')
-    plt.tight_layout()
+    fig = Figure(figsize=(8, 4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.bar(months, amounts, color='skyblue')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Amount ($)')
+    ax.set_title('Monthly Expenses')
+    fig.tight_layout()
     buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
+    fig.savefig(buf, format='png')
     return buf.getvalue()
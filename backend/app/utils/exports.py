@@ -0,0 +1,103 @@
+import csv
+import io
+from typing import AsyncIterator, Callable, List, Literal
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.utils.streaming import STREAM_BATCH_SIZE
+
+ExportFormat = Literal["csv", "parquet"]
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+
+async def rows_from_cursor(cursor, shape: Callable[[dict], dict]) -> AsyncIterator[dict]:
+    async for document in cursor.batch_size(STREAM_BATCH_SIZE):
+        yield shape(document)
+
+
+async def _batches(rows: AsyncIterator[dict]) -> AsyncIterator[List[dict]]:
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _csv(rows: AsyncIterator[dict], schema: pa.Schema) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=schema.names, extrasaction="ignore")
+    writer.writeheader()
+    async for batch in _batches(rows):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _ChunkSink:
+    """Write-only file object the Parquet writer flushes into; drained after every row group."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+async def _parquet(rows: AsyncIterator[dict], schema: pa.Schema) -> AsyncIterator[bytes]:
+    # One row group per batch; each is sent as soon as it is encoded, and the
+    # footer (row group offsets) follows once the cursor is exhausted.
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    try:
+        async for batch in _batches(rows):
+            table = pa.Table.from_pylist(batch, schema=schema)
+            await run_in_threadpool(writer.write_table, table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(
+    rows: AsyncIterator[dict],
+    schema: pa.Schema,
+    format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Stream shaped rows as a CSV or Parquet download. Only STREAM_BATCH_SIZE
+    rows are held at a time, whatever the size of the export.
+    """
+    body = _csv(rows, schema) if format == "csv" else _parquet(rows, schema)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
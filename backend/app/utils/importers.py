@@ -0,0 +1,104 @@
+import codecs
+import csv
+import json
+import re
+from typing import AsyncIterator, Dict, List
+
+# Header aliases seen in common bank exports, mapped onto TransactionCreate fields.
+CSV_COLUMNS = {
+    "date": "date",
+    "posted": "date",
+    "posting date": "date",
+    "transaction date": "date",
+    "amount": "amount",
+    "description": "description",
+    "memo": "description",
+    "payee": "description",
+    "name": "description",
+    "category": "category",
+    "type": "transaction_type",
+    "transaction_type": "transaction_type",
+    "is_recurring": "is_recurring",
+    "recurring_frequency": "recurring_frequency",
+}
+
+_OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.S | re.I)
+_OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[str]:
+    """Decode a byte stream incrementally and yield complete lines."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield pending.rstrip("\r")
+
+
+def _signed(row: Dict[str, object]) -> Dict[str, object]:
+    # Bank exports usually carry a signed amount and no type column.
+    try:
+        amount = float(str(row.get("amount", "")).replace(",", ""))
+    except ValueError:
+        return row
+    if not row.get("transaction_type"):
+        row["transaction_type"] = "expense" if amount < 0 else "income"
+    row["amount"] = abs(amount)
+    return row
+
+
+def _normalize(row: Dict[str, object]) -> Dict[str, object]:
+    row = _signed(row)
+    row["category"] = str(row.get("category") or "other").strip().lower()
+    if row.get("transaction_type"):
+        row["transaction_type"] = str(row["transaction_type"]).strip().lower()
+    return {key: value for key, value in row.items() if value not in (None, "")}
+
+
+async def csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """
+    Yield one dict per CSV record. The first line is the header; columns are
+    matched case-insensitively against CSV_COLUMNS and unknown ones dropped.
+    """
+    header: List[str] = []
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if not header:
+            header = [CSV_COLUMNS.get(name.strip().lower(), "") for name in values]
+            continue
+        yield _normalize({field: value.strip() for field, value in zip(header, values) if field})
+
+
+async def ofx_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Yield one dict per <STMTTRN> block of an OFX/QFX statement (SGML or XML flavour)."""
+    pending = ""
+    async for line in iter_lines(chunks, encoding="latin-1"):
+        pending += line + "\n"
+        if "</STMTTRN>" not in line.upper():
+            continue
+        end = 0
+        for match in _OFX_TRANSACTION.finditer(pending):
+            fields = {name.upper(): value.strip() for name, value in _OFX_FIELD.findall(match.group(1))}
+            posted = fields.get("DTPOSTED", "")
+            yield _normalize({
+                "date": f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if posted else None,
+                "amount": fields.get("TRNAMT"),
+                "description": fields.get("NAME") or fields.get("MEMO"),
+            })
+            end = match.end()
+        pending = pending[end:]
+
+
+async def json_rows(body: bytes) -> AsyncIterator[dict]:
+    rows = json.loads(body or b"[]")
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON array of transactions")
+    for row in rows:
+        yield row
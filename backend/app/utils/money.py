@@ -0,0 +1,62 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import List, Optional, Sequence, Union
+
+Number = Union[int, float, str, Decimal]
+
+# Amounts are stored as integer minor units (`<field>_cents`) next to the float
+# the API exposes. Rounding is half-to-even everywhere.
+CENTS = Decimal("0.01")
+
+
+def to_cents(amount: Optional[Number]) -> int:
+    if amount is None:
+        return 0
+    if isinstance(amount, float):
+        # Round the binary product exactly as AMOUNT_CENTS ($round) and NumPy do,
+        # so live deltas and server-side rebuilds agree on legacy floats:
+        # 0.575 * 100 is 57.49999999999999, which gives 57 on every path.
+        return int(round(amount * 100))
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    return int(value.quantize(CENTS, rounding=ROUND_HALF_EVEN) * 100)
+
+
+def from_cents(cents: int) -> float:
+    return cents / 100
+
+
+def with_cents(document: dict, field: str = "amount") -> dict:
+    """Store `field` rounded to the cent alongside its exact `<field>_cents`; returns the document."""
+    if document.get(field) is not None:
+        cents = to_cents(document[field])
+        document[field] = from_cents(cents)
+        document[f"{field}_cents"] = cents
+    return document
+
+
+def allocate(cents: int, parts: Union[int, Sequence[int]]) -> List[int]:
+    """
+    Split `cents` into integer shares that always sum back to `cents`, using the
+    largest-remainder method. `parts` is a count (equal shares) or a list of
+    weights; leftover cents go to the shares with the largest fractional parts,
+    earlier shares first on ties.
+    """
+    weights = [1] * parts if isinstance(parts, int) else list(parts)
+    total_weight = sum(weights)
+    if not weights or total_weight <= 0:
+        raise ValueError("Allocation needs at least one positive weight.")
+    shares, remainders = [], []
+    for index, weight in enumerate(weights):
+        share, remainder = divmod(cents * weight, total_weight)
+        shares.append(share)
+        remainders.append((-remainder, index))
+    for _, index in sorted(remainders)[: cents - sum(shares)]:
+        shares[index] += 1
+    return shares
+
+
+def cents_expr(field: str) -> dict:
+    """Server-side equivalent of to_cents() for `field`, for documents written before `<field>_cents` existed."""
+    return {"$ifNull": [f"${field}_cents", {"$toLong": {"$round": [{"$multiply": [f"${field}", 100]}, 0]}}]}
+
+
+AMOUNT_CENTS = cents_expr("amount")
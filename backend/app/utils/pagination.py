@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+
+def encode_cursor(value: datetime, object_id: ObjectId) -> str:
+    """Opaque cursor pointing just past the (value, _id) of the last item on a page."""
+    raw = json.dumps({"v": value.isoformat(), "i": str(object_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["v"]), ObjectId(str(data["i"]))
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_filter(field: str, cursor: Optional[str]) -> dict:
+    """
+    Filter selecting documents after `cursor` in (field desc, _id desc) order.
+    Combine it with the base query using $and so existing range filters on
+    `field` are preserved.
+    """
+    if not cursor:
+        return {}
+    value, object_id = decode_cursor(cursor)
+    return {"$or": [
+        {field: {"$lt": value}},
+        {field: value, "_id": {"$lt": object_id}},
+    ]}
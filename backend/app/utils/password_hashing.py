@@ -0,0 +1,98 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+# bcrypt releases the GIL while hashing, so a thread pool gives real parallelism
+# without the pickling overhead of a process pool.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    return _executor
+
+
+class HashingStats:
+    def __init__(self):
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.completed += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": PASSWORD_HASH_WORKERS,
+            "max_queue": PASSWORD_HASH_MAX_QUEUE,
+            "in_flight": self.pending,
+            "queued": max(0, self.pending - PASSWORD_HASH_WORKERS),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_ms_avg": round(self.wait_total / self.completed * 1000, 2) if self.completed else 0,
+            "queue_wait_ms_max": round(self.wait_max * 1000, 2),
+        }
+
+
+stats = HashingStats()
+
+
+async def run_hashing(func: Callable[..., T], *args) -> T:
+    """
+    Run a password hash/verify call on the bounded hashing pool.
+    Requests beyond the workers plus queue capacity are rejected with 503 so a
+    login burst cannot pile up unbounded work behind the event loop.
+    """
+    if stats.pending >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE:
+        stats.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    enqueued = time.perf_counter()
+
+    def task():
+        stats.record_wait(time.perf_counter() - enqueued)
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    stats.pending += 1
+    future = get_executor().submit(task)
+    # A cancelled caller does not stop the hash already running in its thread,
+    # so the slot is released when the job finishes, not when the await ends.
+    future.add_done_callback(lambda _: _release_from_worker(loop))
+    return await asyncio.wrap_future(future)
+
+
+def _release() -> None:
+    stats.pending -= 1
+
+
+def _release_from_worker(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        loop.call_soon_threadsafe(_release)
+    except RuntimeError:  # the loop closed while the job ran
+        _release()
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
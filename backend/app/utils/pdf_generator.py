@@ -1,10 +1,20 @@
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from datetime import datetime
+from typing import List, Optional
 import io
+import zlib
+from app.utils.money import from_cents, to_cents
 
 def generate_pdf_report(title: str, summary: str) -> bytes:
     """
     Generate a simple PDF report with a title and summary.
+    Long summaries continue onto further pages.
     :param title: Title of the report
     :param summary: Summary text
     :return: PDF file as bytes
@@ -14,12 +24,239 @@ def generate_pdf_report(title: str, summary: str) -> bytes:
     width, height = letter
     c.setFont("Helvetica-Bold", 20)
     c.drawString(72, height - 72, title)
+    y = height - 100
     c.setFont("Helvetica", 12)
-    text_object = c.beginText(72, height - 100)
     for line in summary.splitlines():
-        text_object.textLine(line)
-    c.drawText(text_object)
+        if y < 72:
+            c.showPage()
+            c.setFont("Helvetica", 12)
+            y = height - 72
+        c.drawString(72, y, line)
+        y -= 14
     c.showPage()
     c.save()
     buf.seek(0)
     return buf.getvalue()
+
+class _StreamingPdf:
+    """
+    Minimal PDF writer for text-and-rule pages that writes each page to disk as
+    soon as it is finished. Only object offsets and page numbers stay in
+    memory, so the cost of a document does not grow with its page contents.
+    Supports the Helvetica and Helvetica-Bold standard fonts.
+    """
+
+    FONTS = {"Helvetica": "F1", "Helvetica-Bold": "F2"}
+    # Objects 1-4 (catalog, page tree, fonts) are written last by save().
+    FIRST_PAGE_OBJECT = 5
+
+    def __init__(self, path: str, pagesize=letter):
+        self.width, self.height = pagesize
+        self.file = open(path, "wb")
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets = {}
+        self.pages: List[int] = []
+        self.next_object = self.FIRST_PAGE_OBJECT
+        self.ops: List[str] = []
+        self.setFont("Helvetica", 12)
+
+    def setFont(self, name: str, size: float) -> None:
+        self.font, self.size = name, size
+
+    def drawString(self, x: float, y: float, text: str) -> None:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        self.ops.append(f"BT /{self.FONTS[self.font]} {self.size} Tf {x:.2f} {y:.2f} Td ({escaped}) Tj ET")
+
+    def drawRightString(self, x: float, y: float, text: str) -> None:
+        self.drawString(x - stringWidth(text, self.font, self.size), y, text)
+
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.ops.append(f"{x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S")
+
+    def showPage(self) -> None:
+        content = zlib.compress("\n".join(self.ops).encode("cp1252", "replace"))
+        contents, page = self.next_object, self.next_object + 1
+        self.next_object += 2
+        self._object(contents, b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(content), content))
+        self._object(page, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width:g} {self.height:g}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {contents} 0 R >>"
+        ).encode())
+        self.pages.append(page)
+        self.ops = []
+
+    def save(self) -> None:
+        for number, base_font in ((3, "Helvetica"), (4, "Helvetica-Bold")):
+            self._object(number, f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} /Encoding /WinAnsiEncoding >>".encode())
+        kids = " ".join(f"{page} 0 R" for page in self.pages)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>".encode())
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self.file.tell()
+        self.file.write(b"xref\n0 %d\n0000000000 65535 f \n" % self.next_object)
+        for number in range(1, self.next_object):
+            self.file.write(b"%010d 00000 n \n" % self.offsets[number])
+        self.file.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self.next_object, xref))
+        self.file.close()
+
+    def _object(self, number: int, body: bytes) -> None:
+        self.offsets[number] = self.file.tell()
+        self.file.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+
+class StatementWriter:
+    """
+    Incremental transaction statement writer.
+    Rows are fed in batches and drawn onto the current page; a new page (with
+    the column header repeated) starts whenever it fills, and each finished
+    page is written to the file straight away, so memory stays flat however
+    long the statement runs.
+    """
+
+    COLUMNS = (("Date", 54), ("Description", 130), ("Category", 340), ("Type", 430), ("Amount", 558))
+    ROW_HEIGHT = 13
+    MARGIN = 54
+
+    def __init__(self, path: str, title: str, period: str):
+        self.canvas = _StreamingPdf(path, pagesize=letter)
+        self.width, self.height = letter
+        self.title = title
+        self.period = period
+        self.page = 0
+        self.rows = 0
+        self.income_cents = 0
+        self.expense_cents = 0
+        self._new_page()
+
+    def _new_page(self) -> None:
+        if self.page:
+            self._footer()
+            self.canvas.showPage()
+        self.page += 1
+        c = self.canvas
+        y = self.height - self.MARGIN
+        if self.page == 1:
+            c.setFont("Helvetica-Bold", 16)
+            c.drawString(self.MARGIN, y, self.title)
+            c.setFont("Helvetica", 10)
+            c.drawString(self.MARGIN, y - 16, self.period)
+            y -= 40
+        c.setFont("Helvetica-Bold", 9)
+        for label, x in self.COLUMNS:
+            if label == "Amount":
+                c.drawRightString(x, y, label)
+            else:
+                c.drawString(x, y, label)
+        c.line(self.MARGIN, y - 4, self.width - self.MARGIN, y - 4)
+        c.setFont("Helvetica", 9)
+        self.y = y - self.ROW_HEIGHT - 4
+
+    def _footer(self) -> None:
+        self.canvas.setFont("Helvetica", 8)
+        self.canvas.drawRightString(self.width - self.MARGIN, 30, f"Page {self.page}")
+
+    def write_rows(self, rows: List[dict]) -> None:
+        c = self.canvas
+        for row in rows:
+            if self.y < self.MARGIN:
+                self._new_page()
+            amount = row.get("amount", 0)
+            cents = row.get("amount_cents")
+            if cents is None:
+                cents = to_cents(amount)
+            transaction_type = row.get("transaction_type") or row.get("type") or ""
+            if transaction_type == "income":
+                self.income_cents += cents
+            elif transaction_type == "expense":
+                self.expense_cents += cents
+            values = (
+                row["date"].strftime("%Y-%m-%d") if row.get("date") else "",
+                (row.get("description") or "")[:40],
+                row.get("category") or "",
+                transaction_type,
+            )
+            for (_, x), value in zip(self.COLUMNS, values):
+                c.drawString(x, self.y, str(value))
+            c.drawRightString(self.COLUMNS[-1][1], self.y, _money(amount))
+            self.y -= self.ROW_HEIGHT
+            self.rows += 1
+
+    def close(self) -> None:
+        c = self.canvas
+        if self.y < self.MARGIN + 4 * self.ROW_HEIGHT:
+            self._new_page()
+        c.line(self.MARGIN, self.y + 6, self.width - self.MARGIN, self.y + 6)
+        c.setFont("Helvetica-Bold", 9)
+        for label, value in (
+            (f"{self.rows} transactions", None),
+            ("Total income", from_cents(self.income_cents)),
+            ("Total expenses", from_cents(self.expense_cents)),
+            ("Net", from_cents(self.income_cents - self.expense_cents)),
+        ):
+            self.y -= self.ROW_HEIGHT
+            c.drawString(self.COLUMNS[0][1], self.y, label)
+            if value is not None:
+                c.drawRightString(self.COLUMNS[-1][1], self.y, _money(value))
+        self._footer()
+        c.showPage()
+        c.save()
+
+    def abort(self) -> None:
+        """Release the output file after a failed run; the caller removes it."""
+        self.canvas.file.close()
+
+def render_financial_report_pdf(path: str, title: str, summary: dict, chart_png: Optional[bytes] = None) -> str:
+    """
+    Render a multi-page financial report to `path`.
+    Tables split across pages automatically and repeat their header row.
+    :param path: Destination file
+    :param title: Title of the report
+    :param summary: FinancialSummary-shaped dict
+    :param chart_png: Optional PNG to embed after the summary table
+    :return: The path written
+    """
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(path, pagesize=letter, title=title)
+    story = [
+        Paragraph(title, styles["Title"]),
+        Paragraph(f"Generated {datetime.utcnow():%Y-%m-%d %H:%M} UTC", styles["Normal"]),
+        Spacer(1, 18),
+        Paragraph("Summary", styles["Heading2"]),
+        _table([
+            ["Total income", _money(summary.get("total_income", 0))],
+            ["Total expenses", _money(summary.get("total_expenses", 0))],
+            ["Net income", _money(summary.get("net_income", 0))],
+            ["Savings rate", f"{summary.get('savings_rate', 0):.1f}%"],
+        ], header=False),
+    ]
+    if chart_png:
+        story += [Spacer(1, 18), Image(io.BytesIO(chart_png), width=6.5 * inch, height=3.25 * inch)]
+    for heading, rows, key in (
+        ("Monthly Trend", summary.get("monthly_trend", []), "month"),
+        ("Category Breakdown", summary.get("category_breakdown", []), "category"),
+    ):
+        if not rows:
+            continue
+        story += [
+            Spacer(1, 18),
+            Paragraph(heading, styles["Heading2"]),
+            _table(
+                [[key.title(), "Income", "Expense", "Net"]]
+                + [[row[key], _money(row["income"]), _money(row["expense"]), _money(row["net"])] for row in rows]
+            ),
+        ]
+    doc.build(story)
+    return path
+
+def _money(value: float) -> str:
+    return f"${value:,.2f}"
+
+def _table(rows: List[list], header: bool = True) -> Table:
+    table = Table(rows, repeatRows=1 if header else 0, hAlign="LEFT")
+    style = [
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+    ]
+    if header:
+        style.append(("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey))
+    table.setStyle(TableStyle(style))
+    return table
@@ -0,0 +1,31 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# CPU-bound rendering and simulation run here so they neither hold the event
+# loop nor contend for the GIL with request handling.
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+    return _executor
+
+
+async def run_in_process(func: Callable[..., T], *args) -> T:
+    """Run a picklable, module-level function on the shared worker process pool."""
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), func, *args)
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -78,8 +78,8 @@ class TransactionUpdate(BaseModel):
     recurring_frequency: Optional[str] = None
 
 class Transaction(TransactionBase):
-    id: int
-    user_id: int
+    id: str
+    user_id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -124,8 +124,8 @@ class ReportCreate(ReportBase):
     pass
 
 class Report(ReportBase):
-    id: int
-    user_id: int
+    id: str
+    user_id: str
     generated_at: datetime
 
     class Config:
@@ -172,7 +172,8 @@ class Message(BaseModel):
 
 class PaginatedResponse(BaseModel):
     items: List[dict]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int 
\ No newline at end of file
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None 
\ No newline at end of file
@@ -0,0 +1,99 @@
+import json
+import os
+from typing import AsyncIterator, Callable, Literal, Optional, Type
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+
+StreamFormat = Literal["json", "ndjson"]
+
+
+def projection_for(model: Type[BaseModel], *extra: str) -> dict:
+    """
+    Project the fields a response schema exposes (by alias, so `_id` stays
+    `_id`), plus `extra` stored fields a `prepare` hook maps onto them.
+    """
+    fields = getattr(model, "model_fields", None) or model.__fields__
+    projection = {(field.alias or name): 1 for name, field in fields.items()}
+    projection.update({name: 1 for name in extra})
+    return projection
+
+
+def _encode(document: dict) -> str:
+    return json.dumps(jsonable_encoder(document, custom_encoder={ObjectId: str}))
+
+
+class RowEncoder:
+    """
+    Encodes streamed documents the way `response_model` would: each one is
+    validated against `model` and serialized by alias, so undeclared fields
+    never leak. Documents that fail validation are skipped and reported.
+    """
+
+    def __init__(self, model: Type[BaseModel], prepare: Optional[Callable[[dict], dict]] = None):
+        self.model = model
+        self.prepare = prepare
+
+    def __call__(self, document: dict) -> Optional[str]:
+        if "_id" in document:
+            document["_id"] = str(document["_id"])
+        if self.prepare:
+            document = self.prepare(document)
+        try:
+            row = self.model.model_validate(document)
+        except ValidationError as exc:
+            print(f"⚠️  Skipping {self.model.__name__} {document.get('_id')}: {exc.error_count()} invalid field(s)")
+            return None
+        return row.model_dump_json(by_alias=True)
+
+
+async def _batches(cursor, encode: Callable[[dict], Optional[str]]) -> AsyncIterator[list]:
+    # Flush one chunk per cursor batch: memory stays bounded by STREAM_BATCH_SIZE
+    # documents while avoiding a network write per row.
+    batch = []
+    async for document in cursor:
+        row = encode(document)
+        if row is None:
+            continue
+        batch.append(row)
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _ndjson(cursor, encode) -> AsyncIterator[str]:
+    async for batch in _batches(cursor, encode):
+        yield "\n".join(batch) + "\n"
+
+
+async def _json_array(cursor, encode) -> AsyncIterator[str]:
+    yield "["
+    separator = ""
+    async for batch in _batches(cursor, encode):
+        yield separator + ",".join(batch)
+        separator = ","
+    yield "]"
+
+
+def stream_cursor(
+    cursor,
+    format: StreamFormat = "json",
+    model: Optional[Type[BaseModel]] = None,
+    prepare: Optional[Callable[[dict], dict]] = None,
+) -> StreamingResponse:
+    """
+    Stream a Motor cursor as a JSON array (the default, matching the previous
+    list responses) or as newline-delimited JSON. StreamingResponse bypasses
+    the route's `response_model`, so pass the same `model` here to validate
+    and filter each row.
+    """
+    cursor = cursor.batch_size(STREAM_BATCH_SIZE)
+    encode = RowEncoder(model, prepare) if model else _encode
+    if format == "ndjson":
+        return StreamingResponse(_ndjson(cursor, encode), media_type="application/x-ndjson")
+    return StreamingResponse(_json_array(cursor, encode), media_type="application/json")
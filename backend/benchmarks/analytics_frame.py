@@ -0,0 +1,77 @@
+"""
+Benchmark the vectorized metrics behind /api/advisor/recommendations (totals
+and expense per category) against the per-row Python loops they replaced.
+
+    python benchmarks/analytics_frame.py --rows 10000 100000 1000000
+
+Runs without a database: rows are synthetic dicts shaped like the documents
+returned by the transactions cursor.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import frame_analytics  # noqa: E402
+
+CATEGORIES = ["salary", "investment", "food", "transport", "rent", "utilities", "shopping", "other"]
+
+
+def synthetic_rows(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    start = datetime(2015, 1, 1)
+    span = int(timedelta(days=365 * 10).total_seconds())
+    return [
+        {
+            "date": start + timedelta(seconds=rng.randrange(span)),
+            "category": rng.choice(CATEGORIES),
+            "transaction_type": "income" if rng.random() < 0.3 else "expense",
+            "amount": round(rng.uniform(1, 2000), 2),
+        }
+        for _ in range(count)
+    ]
+
+
+def per_row_metrics(transactions: list) -> dict:
+    total_income = sum(t["amount"] for t in transactions if t["transaction_type"] == "income")
+    total_expenses = sum(t["amount"] for t in transactions if t["transaction_type"] == "expense")
+    category_spending = {}
+    for t in transactions:
+        if t["transaction_type"] == "expense":
+            category_spending[t["category"]] = category_spending.get(t["category"], 0) + t["amount"]
+    return {"total_income": total_income, "total_expenses": total_expenses, "categories": category_spending}
+
+
+def frame_metrics(frame) -> dict:
+    return {**frame_analytics.totals(frame), "categories": frame_analytics.expense_by_category(frame)}
+
+
+def timed(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(args):
+    print(f"{'rows':>10} {'per-row':>10} {'frame build':>12} {'vectorized':>11} {'speedup':>8}")
+    for count in args.rows:
+        rows = synthetic_rows(count)
+        loop = timed(per_row_metrics, rows)
+        build = timed(frame_analytics.to_frame, rows)
+        frame = frame_analytics.to_frame(rows)
+        compute = timed(frame_metrics, frame)
+        print(f"{count:>10} {loop * 1000:>8.1f}ms {build * 1000:>10.1f}ms {compute * 1000:>9.1f}ms "
+              f"{loop / compute:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+"""
+Load benchmark for GET /api/users/me.
+
+Registers (or reuses) a benchmark user, logs in once, then drives the endpoint
+from N concurrent clients and reports latency percentiles for the running
+server. It needs a live MongoDB; no reference numbers are recorded here.
+
+    uvicorn app.main:app --workers 1
+    python benchmarks/users_me_latency.py --clients 500 --requests 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def get_token(client: httpx.AsyncClient, username: str, password: str) -> str:
+    await client.post("/api/users/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": password,
+    })
+    response = await client.post("/api/users/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def worker(client: httpx.AsyncClient, headers: dict, requests: int, latencies: list, errors: list):
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/users/me", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        token = await get_token(client, args.username, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        latencies, errors = [], []
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, headers, args.requests, latencies, errors) for _ in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+    print(f"clients={args.clients} requests={len(latencies)} errors={len(errors)} elapsed={elapsed:.2f}s")
+    print(f"throughput={len(latencies) / elapsed:.0f} req/s")
+    print(f"mean={statistics.mean(latencies):.1f}ms p50={percentile(latencies, 50):.1f}ms "
+          f"p95={percentile(latencies, 95):.1f}ms p99={percentile(latencies, 99):.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--username", default="bench_user")
+    parser.add_argument("--password", default="bench-password")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+import asyncio
+import copy
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from app.utils import auth
+
+
+class FakeUser:
+    username = "alice"
+    lookups = 0
+
+    def __init__(self):
+        self.full_name = "Alice"
+
+    def model_copy(self, deep=False):
+        return copy.deepcopy(self)
+
+    @classmethod
+    async def find_one(cls, _):
+        cls.lookups += 1
+        return cls()
+
+
+@pytest.fixture(autouse=True)
+def fake_users(monkeypatch):
+    monkeypatch.setattr(auth, "User", FakeUser)
+    FakeUser.lookups = 0
+    auth.principal_cache.clear()
+    yield
+    auth.principal_cache.clear()
+
+
+def current_user(token):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(auth.get_current_user(credentials))
+
+
+def test_token_without_exp_is_accepted_and_cached():
+    token = jwt.encode({"sub": "alice"}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    assert current_user(token).full_name == "Alice"
+    assert current_user(token).full_name == "Alice"
+    assert FakeUser.lookups == 1
+
+
+def test_requests_do_not_share_the_cached_user():
+    token = auth.create_access_token({"sub": "alice"})
+    first = current_user(token)
+    first.full_name = "Mutated"
+    second = current_user(token)
+    assert second.full_name == "Alice"
+    assert second is not first
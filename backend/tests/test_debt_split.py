@@ -0,0 +1,43 @@
+from app.services.debt_split import settlement_plan, split_deltas
+
+
+def test_split_deltas_sum_to_zero_with_uneven_shares():
+    deltas = split_deltas({"payer_id": "ana", "amount_cents": 1000, "participants": ["ana", "ben", "cy"]})
+    assert deltas == {"ana": 1000 - 334, "ben": -333, "cy": -333}
+    assert sum(deltas.values()) == 0
+
+
+def test_split_deltas_falls_back_to_the_float_amount():
+    deltas = split_deltas({"payer_id": "ana", "amount": 10.0, "participants": ["ben", "cy"]})
+    assert deltas == {"ana": 1000, "ben": -500, "cy": -500}
+
+
+def test_split_deltas_sign_reverses_a_split():
+    split = {"payer_id": "ana", "amount_cents": 901, "participants": ["ben", "cy"]}
+    forward, backward = split_deltas(split), split_deltas(split, sign=-1)
+    assert {member: -cents for member, cents in forward.items()} == backward
+
+
+def test_split_deltas_without_participants_is_empty():
+    assert split_deltas({"payer_id": "ana", "amount_cents": 100, "participants": []}) == {}
+
+
+def test_settlement_plan_clears_every_balance():
+    balances = {"ana": 5000, "ben": -2000, "cy": -2500, "dee": -500, "eve": 0}
+    plan = settlement_plan(balances)
+    assert len(plan) <= 3
+    remaining = dict(balances)
+    for transfer in plan:
+        cents = round(transfer["amount"] * 100)
+        remaining[transfer["from"]] += cents
+        remaining[transfer["to"]] -= cents
+    assert all(cents == 0 for cents in remaining.values())
+
+
+def test_settlement_plan_matches_largest_creditor_and_debtor_first():
+    plan = settlement_plan({"ana": 300, "ben": 100, "cy": -250, "dee": -150})
+    assert plan[0] == {"from": "cy", "to": "ana", "amount": 2.5}
+
+
+def test_settlement_plan_of_settled_group_is_empty():
+    assert settlement_plan({"ana": 0, "ben": 0}) == []
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from app.services.goal_simulation import PERCENTILES, months_between, simulate
+
+
+def params(**overrides):
+    return {
+        "history": [100.0, 200.0, 300.0],
+        "current_amount": 1000.0,
+        "target_amount": 5000.0,
+        "months": 24,
+        "paths": 500,
+        "annual_return": 0.03,
+        "return_volatility": 0.05,
+        "inflation": 0.02,
+        "seed": 42,
+        **overrides,
+    }
+
+
+def test_simulate_is_reproducible_for_a_seed():
+    assert simulate(params()) == simulate(params())
+    assert simulate(params()) != simulate(params(seed=7))
+
+
+def test_simulate_shapes_and_ordered_bands():
+    outcome = simulate(params())
+    bands = np.array(outcome["bands"])
+    assert bands.shape == (24, len(PERCENTILES))
+    assert np.all(np.diff(bands, axis=1) >= 0)
+    assert 0.0 <= outcome["probability"] <= outcome["probability_reached_anytime"] <= 1.0
+
+
+def test_simulate_without_volatility_matches_the_closed_form():
+    # Constant contribution and no return: the balance is linear in time.
+    outcome = simulate(params(history=[250.0], return_volatility=0.0, annual_return=0.0, inflation=0.0, months=12))
+    assert outcome["final_percentiles"]["p50"] == pytest.approx(1000.0 + 12 * 250.0)
+    assert outcome["probability"] == 0.0
+    reached = simulate(params(history=[250.0], return_volatility=0.0, annual_return=0.0, inflation=0.0, months=16))
+    assert reached["probability"] == 1.0
+    assert reached["median_months_to_goal"] == 16
+
+
+def test_simulate_without_history_only_compounds_savings():
+    outcome = simulate(params(history=[], return_volatility=0.0, annual_return=0.0, inflation=0.0))
+    assert outcome["final_percentiles"]["p95"] == pytest.approx(1000.0)
+    assert outcome["median_months_to_goal"] is None
+
+
+def test_months_between_rounds_partial_months_up():
+    today = date(2026, 10, 17)
+    assert months_between(today, date(2026, 10, 30)) == 1
+    assert months_between(today, date(2026, 11, 17)) == 1
+    assert months_between(today, datetime(2026, 11, 18)) == 2
+    assert months_between(today, today) == 0
+    assert months_between(today, date(2026, 9, 1)) == 0
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from app.utils.importers import csv_rows, iter_lines, json_rows, ofx_rows
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def collect(rows) -> list:
+    async def run():
+        return [row async for row in rows]
+    return asyncio.run(run())
+
+
+def test_iter_lines_reassembles_lines_split_across_chunks():
+    data = "first,é\r\nsecond\nthird".encode("utf-8-sig")
+    assert collect(iter_lines(_chunks(data, 3))) == ["first,é", "second", "third"]
+
+
+def test_csv_maps_header_aliases_and_infers_type_from_sign():
+    data = (
+        "Posting Date,Payee,Amount,Unused\n"
+        "2024-01-05,Coffee,-3.50,x\n"
+        "\n"
+        '2024-01-06,"Salary, January","1,200.00",y\n'
+    ).encode()
+    assert collect(csv_rows(_chunks(data, 7))) == [
+        {"date": "2024-01-05", "description": "Coffee", "amount": 3.5, "transaction_type": "expense", "category": "other"},
+        {"date": "2024-01-06", "description": "Salary, January", "amount": 1200.0, "transaction_type": "income", "category": "other"},
+    ]
+
+
+def test_csv_explicit_type_wins_over_sign():
+    data = b"date,amount,type,category\n2024-02-01,25,Expense,Food\n"
+    assert collect(csv_rows(_chunks(data, 64))) == [
+        {"date": "2024-02-01", "amount": 25.0, "transaction_type": "expense", "category": "food"},
+    ]
+
+
+def test_csv_keeps_unparseable_amounts_for_row_validation():
+    data = b"date,amount\n2024-02-01,abc\n"
+    assert collect(csv_rows(_chunks(data, 64))) == [{"date": "2024-02-01", "amount": "abc", "category": "other"}]
+
+
+def test_ofx_sgml_transactions():
+    data = (
+        b"OFXHEADER:100\n<OFX><BANKTRANLIST>\n"
+        b"<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20240105120000\n<TRNAMT>-42.10\n<NAME>Grocer\n</STMTTRN>\n"
+        b"<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240107<TRNAMT>1000.00<MEMO>Pay</STMTTRN>\n"
+        b"</BANKTRANLIST></OFX>\n"
+    )
+    assert collect(ofx_rows(_chunks(data, 5))) == [
+        {"date": "2024-01-05", "amount": 42.1, "description": "Grocer", "transaction_type": "expense", "category": "other"},
+        {"date": "2024-01-07", "amount": 1000.0, "description": "Pay", "transaction_type": "income", "category": "other"},
+    ]
+
+
+def test_json_rows_requires_an_array():
+    assert collect(json_rows(b'[{"amount": 1}]')) == [{"amount": 1}]
+    with pytest.raises(ValueError):
+        collect(json_rows(b'{"amount": 1}'))
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.services.rollups import bucket_cents
+from app.utils.money import allocate, from_cents, to_cents, with_cents
+
+
+def test_to_cents_rounds_floats():
+    assert to_cents(0.1) == 10
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(19.99) == 1999
+
+
+@pytest.mark.parametrize("amount", [2.675, 0.545, 0.575, 1.015, 1.225, 0.125, 1234.565, -0.575])
+def test_to_cents_matches_the_server_side_rounding(amount):
+    # AMOUNT_CENTS rounds amount * 100 as a double, half to even, like np.round.
+    assert to_cents(amount) == int(np.round(amount * 100))
+
+
+def test_to_cents_of_a_legacy_float_agrees_with_the_rebuild():
+    # The binary products sit below and above the half: 57.49999999999999, 122.50000000000001.
+    assert to_cents(0.575) == 57
+    assert to_cents(1.225) == 123
+    assert to_cents(2.675) == 268
+
+
+def test_to_cents_rounds_half_to_even():
+    assert to_cents("0.125") == 12
+    assert to_cents("0.135") == 14
+    assert to_cents(Decimal("-2.005")) == -200
+
+
+def test_to_cents_accepts_none_and_ints():
+    assert to_cents(None) == 0
+    assert to_cents(7) == 700
+
+
+def test_with_cents_rounds_the_float_field():
+    document = with_cents({"amount": 10.006})
+    assert document == {"amount": 10.01, "amount_cents": 1001}
+    assert from_cents(document["amount_cents"]) == document["amount"]
+
+
+def test_allocate_equal_shares_sum_back():
+    assert allocate(100, 3) == [34, 33, 33]
+    assert sum(allocate(1001, 7)) == 1001
+
+
+def test_allocate_weighted_gives_leftovers_to_largest_remainders():
+    assert allocate(100, [1, 1, 2]) == [25, 25, 50]
+    assert allocate(10, [1, 2]) == [3, 7]
+
+
+def test_allocate_rejects_no_positive_weight():
+    with pytest.raises(ValueError):
+        allocate(100, [0, 0])
+    with pytest.raises(ValueError):
+        allocate(100, 0)
+
+
+def test_bucket_cents_adds_the_legacy_float_amount():
+    assert bucket_cents({"amount_cents": 500}) == 500
+    assert bucket_cents({"amount": 12.34}) == 1234
+    # A pre-cents bucket that has since received an $inc on amount_cents.
+    assert bucket_cents({"amount": 12.34, "amount_cents": 500}) == 1734
@@ -0,0 +1,50 @@
+import asyncio
+
+from app.services import notifier
+from app.services.notifier import NotifierService, invalidate_unread, unread_cache
+
+
+class FakeNotifications:
+    def __init__(self, unread):
+        self.unread = unread
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def count_documents(self, query):
+        self.calls += 1
+        snapshot = self.unread
+        self.started.set()
+        await self.release.wait()
+        return snapshot
+
+
+def test_unread_count_is_cached(monkeypatch):
+    async def scenario():
+        notifications = FakeNotifications(3)
+        notifications.release.set()
+        monkeypatch.setattr(notifier, "db", type("Db", (), {"notifications": notifications}))
+        assert await NotifierService.unread_count("cached") == 3
+        assert await NotifierService.unread_count("cached") == 3
+        assert notifications.calls == 1
+
+    unread_cache.clear()
+    asyncio.run(scenario())
+
+
+def test_count_read_before_a_write_is_not_stored(monkeypatch):
+    async def scenario():
+        notifications = FakeNotifications(3)
+        monkeypatch.setattr(notifier, "db", type("Db", (), {"notifications": notifications}))
+        reader = asyncio.create_task(NotifierService.unread_count("racing"))
+        await notifications.started.wait()
+        # mark_all_read lands while the count is in flight.
+        notifications.unread = 0
+        invalidate_unread("racing")
+        notifications.release.set()
+        assert await reader == 3
+        assert unread_cache.get("racing") is None
+        assert await NotifierService.unread_count("racing") == 0
+
+    unread_cache.clear()
+    asyncio.run(scenario())
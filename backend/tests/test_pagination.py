@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+def raw_cursor(data) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    value, object_id = datetime(2024, 3, 1, 12, 30), ObjectId()
+    assert decode_cursor(encode_cursor(value, object_id)) == (value, object_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor(["v", "i"]),
+    raw_cursor({"v": "2024-03-01"}),
+    raw_cursor({"v": "yesterday", "i": str(ObjectId())}),
+    raw_cursor({"v": "2024-03-01T00:00:00", "i": "not-an-object-id"}),
+    raw_cursor({"v": "2024-03-01T00:00:00", "i": None}),
+])
+def test_tampered_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def test_keyset_filter_breaks_ties_on_id():
+    value, object_id = datetime(2024, 3, 1), ObjectId()
+    assert keyset_filter("date", encode_cursor(value, object_id)) == {"$or": [
+        {"date": {"$lt": value}},
+        {"date": value, "_id": {"$lt": object_id}},
+    ]}
+    assert keyset_filter("date", None) == {}
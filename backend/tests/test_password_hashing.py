@@ -0,0 +1,39 @@
+import asyncio
+import threading
+import pytest
+from app.utils import password_hashing
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    password_hashing.shutdown()
+    yield
+    password_hashing.shutdown()
+
+
+def test_pool_restarts_after_shutdown():
+    assert asyncio.run(password_hashing.run_hashing(pow, 2, 10)) == 1024
+    password_hashing.shutdown()
+    assert asyncio.run(password_hashing.run_hashing(pow, 3, 3)) == 27
+
+
+def test_cancelled_caller_keeps_slot_until_hash_finishes():
+    release = threading.Event()
+
+    async def scenario():
+        task = asyncio.ensure_future(password_hashing.run_hashing(release.wait, 5))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        held = password_hashing.stats.pending
+        release.set()
+        for _ in range(100):
+            if password_hashing.stats.pending < held:
+                break
+            await asyncio.sleep(0.01)
+        return held, password_hashing.stats.pending
+
+    held, after = asyncio.run(scenario())
+    assert held == 1
+    assert after == 0
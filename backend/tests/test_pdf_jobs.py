@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+from app.services import pdf_jobs
+from app.services.pdf_jobs import PdfJobService
+
+
+def job(job_id, finished_at, path=None):
+    return {"job_id": job_id, "user_id": "u1", "status": "done", "finished_at": finished_at, "path": path}
+
+
+def test_status_reads_prune_expired_jobs_and_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_jobs, "PDF_JOB_RETENTION_SECONDS", 60)
+    expired = tmp_path / "old.pdf"
+    expired.write_bytes(b"%PDF")
+    now = datetime.utcnow()
+    monkeypatch.setattr(PdfJobService, "jobs", {
+        "old": job("old", now - timedelta(seconds=120), str(expired)),
+        "fresh": job("fresh", now),
+        "queued": job("queued", None),
+    })
+    assert PdfJobService.get("old", "u1") is None
+    assert not expired.exists()
+    assert PdfJobService.get("fresh", "u1")["job_id"] == "fresh"
+    assert set(PdfJobService.jobs) == {"fresh", "queued"}
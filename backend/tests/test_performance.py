@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from app.services.performance import annualize, daily_returns, irr, max_drawdown, time_weighted_return
+
+
+def test_daily_returns_take_contributions_out():
+    values = np.array([100.0, 110.0, 220.0])
+    flows = np.array([100.0, 0.0, 100.0])
+    returns = daily_returns(values, flows)
+    # Day one starts from nothing; day three's deposit is not a gain.
+    assert returns == pytest.approx([0.0, 0.1, 120.0 / 110.0 - 1.0])
+    assert time_weighted_return(returns) == pytest.approx(1.1 * 120.0 / 110.0 - 1.0)
+
+
+def test_max_drawdown_is_the_deepest_peak_to_trough_fall():
+    returns = np.array([0.1, -0.5, 0.2, 0.5])
+    assert max_drawdown(returns) == pytest.approx(-0.5)
+    assert max_drawdown(np.array([0.01, 0.02])) == 0.0
+    assert max_drawdown(np.array([])) == 0.0
+
+
+def test_max_drawdown_counts_an_initial_loss():
+    assert max_drawdown(np.array([-0.2, 0.1])) == pytest.approx(-0.2)
+
+
+def test_irr_of_a_single_investment_is_its_annual_growth():
+    amounts = np.array([-1000.0, 1100.0])
+    days = np.array([0.0, 365.0])
+    assert irr(amounts, days) == pytest.approx(0.1)
+
+
+def test_irr_solves_multiple_flows():
+    amounts = np.array([-1000.0, -500.0, 1700.0])
+    days = np.array([0.0, 182.0, 365.0])
+    rate = irr(amounts, days)
+    npv = np.sum(amounts * (1.0 + rate) ** -(days / 365))
+    assert npv == pytest.approx(0.0, abs=1e-6)
+
+
+def test_irr_handles_a_near_total_loss():
+    assert irr(np.array([-1000.0, 10.0]), np.array([0.0, 365.0])) == pytest.approx(-0.99)
+
+
+def test_irr_needs_flows_both_ways():
+    assert irr(np.array([-100.0, -50.0]), np.array([0.0, 1.0])) is None
+    assert irr(np.array([0.0, 100.0]), np.array([0.0, 1.0])) is None
+
+
+def test_annualize_rejects_empty_periods_and_total_losses():
+    assert annualize(0.1, 365) == pytest.approx(0.1)
+    assert annualize(0.1, 0) is None
+    assert annualize(-1.0, 30) is None
@@ -0,0 +1,29 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from app.services.prices import parse_price_csv
+
+
+def test_symbol_column_wins_over_argument():
+    prices = parse_price_csv(io.StringIO("Date,Close,Symbol\n2024-01-02,10.5,aapl\n"), "MSFT")
+    assert prices == [{"symbol": "AAPL", "date": datetime(2024, 1, 2), "close": 10.5}]
+
+
+def test_short_and_null_rows_are_skipped():
+    content = "symbol,date,close\nAAPL,2024-01-02,10\nAAPL,2024-01-03\nAAPL\n,2024-01-04,11\nAAPL,2024-01-05,null\n"
+    prices = parse_price_csv(io.StringIO(content))
+    assert [price["date"] for price in prices] == [datetime(2024, 1, 2)]
+
+
+def test_trailing_symbol_column_short_row_is_skipped():
+    prices = parse_price_csv(io.StringIO("date,close,ticker\n2024-01-02,10\n2024-01-03,11,MSFT\n"))
+    assert prices == [{"symbol": "MSFT", "date": datetime(2024, 1, 3), "close": 11.0}]
+
+
+def test_missing_columns_are_rejected():
+    with pytest.raises(ValueError):
+        parse_price_csv(io.StringIO("date,volume\n2024-01-02,100\n"), "AAPL")
+    with pytest.raises(ValueError):
+        parse_price_csv(io.StringIO("date,close\n2024-01-02,10\n"))
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from app.services.recurrence import occurrence, rewatermark
+
+
+def template(**fields):
+    return {
+        "date": datetime(2024, 1, 31),
+        "is_recurring": True,
+        "recurring_frequency": "monthly",
+        "recurrence_index": 4,
+        "recurrence_next": datetime(2024, 5, 31),
+        **fields,
+    }
+
+
+def test_occurrence_clamps_to_month_end_and_recovers():
+    anchor = datetime(2024, 1, 31)
+    assert occurrence(anchor, "monthly", 1) == datetime(2024, 2, 29)
+    assert occurrence(anchor, "monthly", 2) == datetime(2024, 3, 31)
+
+
+def test_rewatermark_ignores_unrelated_changes():
+    before = template()
+    assert rewatermark(before, {**before, "amount": 12.5}) is None
+
+
+def test_rewatermark_resumes_after_materialized_occurrences():
+    # Occurrences up to 2024-04-30 exist; a new weekly anchor resumes after it.
+    before = template()
+    fields = rewatermark(before, {**before, "recurring_frequency": "weekly", "date": datetime(2024, 4, 1)})
+    assert fields["recurrence_next"] == datetime(2024, 5, 6)
+    assert occurrence(datetime(2024, 4, 1), "weekly", fields["recurrence_index"]) == fields["recurrence_next"]
+
+
+def test_rewatermark_starts_fresh_when_nothing_was_materialized():
+    before = template(recurrence_index=None, recurrence_next=None)
+    fields = rewatermark(before, {**before, "date": datetime(2024, 2, 15)})
+    assert fields == {"recurrence_index": 1, "recurrence_next": datetime(2024, 3, 15)}
+
+
+def test_rewatermark_clears_when_no_longer_recurring():
+    before = template()
+    assert rewatermark(before, {**before, "is_recurring": False}) == {
+        "recurrence_index": None,
+        "recurrence_next": None,
+    }
@@ -0,0 +1,39 @@
+import re
+import zlib
+from datetime import datetime
+
+from app.utils.pdf_generator import StatementWriter
+
+
+def write_statement(path, count):
+    writer = StatementWriter(str(path), "Transaction Statement", "beginning to 2024-12-31")
+    writer.write_rows([
+        {"date": datetime(2024, 1, 1), "description": "Coffee (large)", "category": "food",
+         "transaction_type": "expense" if i % 2 else "income", "amount": 1.25, "amount_cents": 125}
+        for i in range(count)
+    ])
+    writer.close()
+    return writer, path.read_bytes()
+
+
+def test_statement_pages_and_totals(tmp_path):
+    writer, data = write_statement(tmp_path / "statement.pdf", 120)
+    assert data.startswith(b"%PDF-1.4") and data.rstrip().endswith(b"%%EOF")
+    assert writer.page == 3
+    assert re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count 3", data)
+    contents = b"".join(
+        zlib.decompress(stream) for stream in re.findall(rb"stream\n(.*?)\nendstream", data, re.S)
+    )
+    assert b"(Coffee \\(large\\)) Tj" in contents
+    assert b"(120 transactions) Tj" in contents
+    assert b"($75.00) Tj" in contents
+
+
+def test_xref_offsets_point_at_their_objects(tmp_path):
+    _, data = write_statement(tmp_path / "statement.pdf", 10)
+    xref = int(data.rsplit(b"startxref\n", 1)[1].split()[0])
+    lines = data[xref:].split(b"\n")
+    count = int(lines[1].split()[1])
+    for number in range(1, count):
+        offset = int(lines[2 + number].split()[0])
+        assert data[offset:].startswith(b"%d 0 obj\n" % number)
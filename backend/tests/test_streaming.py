@@ -0,0 +1,39 @@
+import json
+from datetime import datetime
+from bson import ObjectId
+from app.database.schemas.transactions import TransactionSchema
+from app.routes.income_expense import _as_schema
+from app.utils.streaming import RowEncoder, projection_for
+
+
+def test_projection_includes_aliases_and_extra_fields():
+    projection = projection_for(TransactionSchema, "transaction_type")
+    assert projection["_id"] == 1
+    assert projection["transaction_type"] == 1
+    assert "id" not in projection
+
+
+def test_rows_are_validated_and_filtered_like_response_model():
+    encode = RowEncoder(TransactionSchema, _as_schema)
+    object_id = ObjectId()
+    row = json.loads(encode({
+        "_id": object_id,
+        "user_id": "u",
+        "transaction_type": "expense",
+        "amount": 0.3,
+        "amount_cents": 30,
+        "date": datetime(2024, 1, 2),
+        "internal": "not exposed",
+    }))
+    assert row == {
+        "_id": str(object_id),
+        "user_id": "u",
+        "type": "expense",
+        "amount": 0.3,
+        "date": "2024-01-02T00:00:00",
+        "description": None,
+    }
+
+
+def test_invalid_rows_are_skipped():
+    assert RowEncoder(TransactionSchema)({"_id": ObjectId(), "user_id": "u", "date": "never"}) is None
@@ -0,0 +1,21 @@
+from pymongo.errors import DuplicateKeyError
+
+from app.database.user_repository import _duplicate_field
+
+
+def duplicate(message, key_pattern=None):
+    details = {"code": 11000, "errmsg": message}
+    if key_pattern is not None:
+        details["keyPattern"] = key_pattern
+    return DuplicateKeyError(message, 11000, details)
+
+
+def test_duplicate_field_reads_the_key_pattern():
+    assert _duplicate_field(duplicate("E11000 duplicate key", {"email": 1})) == "email"
+    assert _duplicate_field(duplicate("E11000 duplicate key", {"username": 1})) == "username"
+
+
+def test_duplicate_field_falls_back_to_the_index_name():
+    message = "E11000 duplicate key error collection: db.users index: email_unique dup key"
+    assert _duplicate_field(duplicate(message)) == "email"
+    assert _duplicate_field(duplicate("E11000 index: username_unique")) == "username"